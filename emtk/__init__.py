@@ -41,14 +41,24 @@ from .operators.dev.add_cluster_type import EMTK_OT_add_cluster_type_object
 from .operators.dev.add_modifiers import EMTK_OT_add_modifiers
 # Operators
 from .operators.dev.add_new_cluster import EMTK_OT_add_new_cluster
+from .operators.dev.benchmark_batch_write import EMTK_OT_benchmark_batch_write
+from .operators.dev.benchmark_modal_dispatch import \
+    EMTK_OT_benchmark_modal_dispatch
 # Modal operators
 from .operators.emtkm import EMTK_OT_emtkm
+from .operators.generate_modal_shortcuts import \
+    EMTK_OT_generate_modal_shortcuts
+from .operators.profile_clusters import EMTK_OT_profile_clusters
+from .operators.restore_mesh_backup import EMTK_OT_restore_mesh_backup
 # Preferences
 from .preferences import EMTKPreferences
 from .ui.clusters_list_popup import EMTK_OT_clusters_list_popup
 from .ui.emtk_panel import VIEW3D_PT_emtk_panel
 # UI
 from .ui.pie_menus import VIEW3D_MT_PIE_emtk_pie_1
+from .utils.clusters_cache import (register_clusters_cache_handlers,
+                                   unregister_clusters_cache_handlers)
+from .utils.shortcuts_index import flush_shortcuts
 
 bl_info = {
     "name": "EMTK",
@@ -74,11 +84,14 @@ classes = [
 
     # libemtk operators
     EMTK_OT_add_cluster_type_object,
+    EMTK_OT_profile_clusters,
+    EMTK_OT_restore_mesh_backup,
 
     # prefs
     EMTKPreferences,
     EMTK_OT_start_editing_modal_shortcut,
     EMTK_OT_add_or_update_modal_shortcut,
+    EMTK_OT_generate_modal_shortcuts,
 
     # popup operators
     EMTK_OT_clusters_list_popup,
@@ -92,6 +105,8 @@ classes = [
     EMTK_OT_add_new_cluster,
     EMTK_OT_add_all_modifiers_and_dump_props,
     EMTK_OT_reparse_default_modifiers_props_kbs,
+    EMTK_OT_benchmark_modal_dispatch,
+    EMTK_OT_benchmark_batch_write,
 
     # property groups
     UIClassVariablesEditorCache,
@@ -136,6 +151,9 @@ def register():
             logger.info(f'Adding property group {line} for {x}')
             prop = bpy.props.PointerProperty(type=UIClassVariablesEditorCache)
             setattr(bpy.types.Scene, line, prop)
+
+    register_clusters_cache_handlers()
+
     try:
         prefs = bpy.context.preferences.addons['emtk'].preferences
         prefs.refresh_cache()
@@ -165,6 +183,12 @@ def unregister():
 
     addon_keymaps.clear()
 
+    unregister_clusters_cache_handlers()
+    try:
+        flush_shortcuts()
+    except KeyError:
+        logger.info('Skipped saving shortcuts.')
+
     for cls in reversed(classes):
         logger.debug(f'Unregister class {cls}')
         bpy.utils.unregister_class(cls)
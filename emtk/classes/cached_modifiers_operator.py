@@ -0,0 +1,81 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import logging
+
+import bpy
+from libemtk.modifiers_operator import (ModifiersOperator,
+                                        _default_cluster_types)
+from libemtk.utils.clusters import save_cluster_type_definition_to_settings
+
+from ..utils.clusters import get_cluster_types
+from ..utils.clusters_cache import get_modifiers_list, store_modifiers_list
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# logger.setLevel(logging.DEBUG)
+
+
+class CachedModifiersOperator(ModifiersOperator):
+    """
+    ModifiersOperator that reuses parsed modifiers lists
+    of objects, which modifiers stack did not change.
+    """
+
+    # Default cluster types were added to addon settings.
+    __default_cluster_types_saved = False
+
+    def create_objects_modifiers_lists(self, *args, **kwargs):
+        """
+        Updates lists of modifiers for selected objects
+        on active view layer.
+        Returns False if no objects selected
+        """
+        objects = bpy.context.view_layer.objects
+        if len(objects.selected) == 0:
+            return False
+
+        # Add some cluster types
+        if not CachedModifiersOperator.__default_cluster_types_saved:
+            for x in _default_cluster_types():
+                save_cluster_type_definition_to_settings(
+                    x.get_this_cluster_parser_variables(), 'emtk')
+            CachedModifiersOperator.__default_cluster_types_saved = True
+
+        cluster_types = None
+        self.selected_objects = []
+        for obj in objects.selected:
+            if len(obj.modifiers) == 0:
+                return False
+
+            # Cluster types are only needed on cache miss.
+            if cluster_types is None:
+                cluster_types = get_cluster_types()
+            m_list = get_modifiers_list(obj, cluster_types)
+
+            # Add modifiers list references
+            self.selected_objects.append(m_list)
+            if obj == objects.active:
+                self.m_list = m_list
+        return True
+
+    def store_objects_modifiers_lists(self) -> None:
+        """Stores edited modifiers lists in cache."""
+        for x in self.selected_objects:
+            store_modifiers_list(x)
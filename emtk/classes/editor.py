@@ -63,10 +63,42 @@ class ModalClustersEditor(ModalInputOperator):
         """Modal method 1."""
         return self.modal_pre(context, event, clusters)
 
+    def editor_stack_changed(self, context, clusters, change):
+        """Called every time modifiers stack changed,
+        but active cluster is the same.
+
+        Returns True, if editor state was patched, or
+        False, if editor should be switched to again.
+        """
+        return self.stack_changed(context, clusters, change)
+
     def editor_modal(self, context, event, clusters):
         """Modal method 2"""
         return self.modal(context, event, clusters)
 
+    def editor_values_changed(self) -> None:
+        """Called every time modifiers props were changed
+        outside of editor.
+        """
+        return
+
+    def get_values_version(self) -> int:
+        """Returns number that changes every time editor
+        changes modifiers properties.
+        """
+        return 0
+
+    def get_ui_state(self):
+        """Returns hashable editor state.
+
+        UI is redrawn every time it changes.
+        """
+        return None
+
+    def get_status_for_ui(self) -> str:
+        """Returns short editor status for statusbar."""
+        return ''
+
     # Editor-specific method placeholders for subclasses
 
     def switched_to(self, context, clusters):
@@ -81,6 +113,10 @@ class ModalClustersEditor(ModalInputOperator):
         """Modal method 1."""
         self._no_editor_method()
 
+    def stack_changed(self, context, clusters, change):
+        """Called every time modifiers stack changed."""
+        return False
+
     def modal(self, context, event, clusters):
         """Modal method 2"""
         self._no_editor_method()
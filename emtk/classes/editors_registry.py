@@ -0,0 +1,125 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import logging
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# logger.setLevel(logging.DEBUG)
+
+
+class EditorsRegistry():
+    """
+    Editors indexed by cluster type.
+
+    Editors can be added as instances or as factories, that are
+    called on first use. Editors for cluster type are returned in
+    the same order they were added, 'ANY' editors included.
+    """
+
+    def __init__(self):
+        # {(name, types): [sequence number, factory, instance]}
+        self.__entries = {}
+
+        # {cluster type: [keys]}, 'ANY' is a type too.
+        self.__index = {}
+
+        # {cluster type: [keys]} sorted by sequence number.
+        self.__lookup = {}
+
+        self.__sequence = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def add(self, factory, name: str, types: list) -> None:
+        """Adds editor factory, replacing editor with same
+        name and types.
+        """
+        if not callable(factory):
+            raise TypeError
+        self.__add(factory, None, name, types)
+
+    def add_instance(self, editor) -> None:
+        """Adds editor instance, replacing editor with same
+        name and types.
+        """
+        self.__add(None, editor, editor.props['name'], editor.props['types'])
+
+    def remove(self, name: str, types: list) -> list:
+        """Removes editor with name and types.
+
+        Returns list with removed editor instance, if it was created.
+        """
+        key = self.__get_key(name, types)
+        entry = self.__entries.pop(key, None)
+        if entry is None:
+            return []
+        for x in key[1]:
+            self.__index[x].remove(key)
+        self.__lookup = {}
+        if entry[2] is None:
+            return []
+        return [entry[2]]
+
+    def get(self, cluster_type: str, initialize=None) -> list:
+        """Returns editors for cluster type.
+
+        Editors are created on first use, initialize is called
+        with every created editor.
+        """
+        keys = self.__lookup.get(cluster_type)
+        if keys is None:
+            keys = self.__index.get(cluster_type, [])
+            if cluster_type != 'ANY':
+                keys = keys + self.__index.get('ANY', [])
+            keys = sorted(set(keys), key=lambda x: self.__entries[x][0])
+            self.__lookup.update({cluster_type: keys})
+
+        result = []
+        for x in keys:
+            entry = self.__entries[x]
+            if entry[2] is None:
+                entry[2] = entry[1]()
+                logger.debug(f'Created editor {x[0]}')
+                if initialize is not None:
+                    initialize(entry[2])
+            result.append(entry[2])
+        return result
+
+    def instances(self) -> list:
+        """Returns editors that were already created."""
+        return [x[2] for x in self.__entries.values() if x[2] is not None]
+
+    def __add(self, factory, editor, name, types) -> None:
+        self.remove(name, types)
+        key = self.__get_key(name, types)
+        self.__entries.update({key: [self.__sequence, factory, editor]})
+        self.__sequence += 1
+        for x in key[1]:
+            self.__index.setdefault(x, []).append(key)
+        self.__lookup = {}
+
+    @staticmethod
+    def __get_key(name, types) -> tuple:
+        if not isinstance(name, str):
+            raise TypeError
+        if not isinstance(types, list):
+            types = [types]
+        return (name, tuple(types))
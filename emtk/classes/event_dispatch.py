@@ -0,0 +1,83 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import logging
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# logger.setLevel(logging.DEBUG)
+
+
+class EventDispatchTable():
+    """
+    Compiled lookup table for modal operators events.
+
+    Maps (event type, event value, shift, ctrl, state) to handlers,
+    so every event is interpreted with a single dict lookup,
+    no matter how many actions operator has.
+    """
+
+    def __init__(self):
+        self.__table = {}
+
+    def __len__(self):
+        return len(self.__table)
+
+    def __contains__(self, key):
+        return key in self.__table
+
+    def build(self, definitions, mappings, handlers) -> None:
+        """Rebuilds table.
+
+        definitions is a list of
+        (action, mapping, event value, shift, ctrl, state) tuples.
+        None matches both True and False for shift, ctrl and state.
+        Earlier definitions take precedence over later ones.
+
+        mappings is a dict with event type for every mapping.
+        handlers is a dict with callable for every action.
+        """
+        if not isinstance(mappings, dict) or not isinstance(handlers, dict):
+            raise TypeError
+
+        table = {}
+        for action, mapping, value, shift, ctrl, state in definitions:
+            event_type = mappings[mapping]
+            handler = handlers[action]
+            for s in self.__expand(shift):
+                for c in self.__expand(ctrl):
+                    for x in self.__expand(state):
+                        table.setdefault(
+                            (event_type, value, s, c, x), handler)
+        self.__table = table
+        logger.debug(f'Built dispatch table with {len(table)} keys.')
+
+    def get(self, event, state: bool = False):
+        """Returns handler for event, or None."""
+        return self.__table.get(
+            (event.type, event.value, event.shift, event.ctrl, state))
+
+    def clear(self) -> None:
+        self.__table = {}
+
+    @staticmethod
+    def __expand(val):
+        if val is None:
+            return (True, False)
+        return (bool(val),)
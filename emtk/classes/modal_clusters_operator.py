@@ -20,10 +20,20 @@
 import logging
 
 import bpy
-from libemtk.modifiers_operator import ModifiersOperator
 from modal_shortcuts.object import ModalInputOperator
 
 from ..ui.emtk_ui import emtk_modifier_ui_draw
+from ..utils.clusters_state import (begin_state_editing, end_state_editing,
+                                    save_dirty_state,
+                                    save_dirty_state_deferred)
+from ..utils.mesh_backup import ArrayMeshBackupStore, MeshBackupStore
+from ..utils.shortcuts_index import (hold_shortcuts_flush,
+                                     release_shortcuts_flush)
+from .cached_modifiers_operator import CachedModifiersOperator
+from .event_dispatch import EventDispatchTable
+from .redraw_scheduler import RedrawScheduler
+from .stack_change import StackChange
+from .status_text_scheduler import StatusTextScheduler
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.ERROR)
@@ -33,7 +43,7 @@ logger.setLevel(logging.ERROR)
 # TODO: actually working modal input str.
 
 
-class ModalClustersOperator(ModalInputOperator, ModifiersOperator):
+class ModalClustersOperator(ModalInputOperator, CachedModifiersOperator):
     """
     Base class for modal operators that use Blender modifier stack
     through ModififersOperator and ExtendedModifiersList.
@@ -56,6 +66,9 @@ class ModalClustersOperator(ModalInputOperator, ModifiersOperator):
     # Selected objects ModifiersList instances.
     # self.selected_objects[]
 
+    # Replay edits on clusters of other selected objects.
+    # self.__broadcast
+
     # Mappings
     __emtk_kbs = {
         'visibility_1': 'V',
@@ -68,9 +81,43 @@ class ModalClustersOperator(ModalInputOperator, ModifiersOperator):
         'up': 'E',
         'down': 'F',
         'collapse': 'R',
+        'broadcast': 'W',
         'exit': 'Q'
     }
 
+    # Actions dispatch table definitions.
+    # (action, mapping, event value, shift, ctrl, selecting clusters)
+    # None matches both states.
+    # Earlier definitions take precedence over later ones.
+    _EMTK_ACTIONS = [
+        ('visibility_render', 'visibility_1', 'PRESS', True, None, None),
+        ('visibility_viewport', 'visibility_1', 'PRESS', False, None, None),
+        ('visibility_on_cage', 'visibility_2', 'PRESS', True, None, None),
+        ('visibility_editmode', 'visibility_2', 'PRESS', False, None, None),
+        ('sort', 'sort', 'PRESS', None, None, None),
+        ('add_new', 'add_new', 'PRESS', None, None, None),
+        ('apply_selection', 'apply_remove', 'PRESS', True, None, True),
+        ('apply', 'apply_remove', 'PRESS', True, None, False),
+        ('deconstruct', 'construct_deconstruct', 'PRESS', True, None, None),
+        ('construct', 'construct_deconstruct', 'PRESS', False, None, True),
+        ('construct_no_selection',
+         'construct_deconstruct', 'PRESS', False, None, False),
+        ('toggle_selection', 'toogle_selection', 'PRESS', None, None, None),
+        ('remove_selection', 'apply_remove', 'PRESS', False, None, True),
+        ('remove', 'apply_remove', 'PRESS', False, None, False),
+        ('move_up_selection', 'up', 'PRESS', True, None, True),
+        ('move_up', 'up', 'PRESS', True, None, False),
+        ('move_down_selection', 'down', 'PRESS', True, None, True),
+        ('move_down', 'down', 'PRESS', True, None, False),
+        ('broadcast', 'broadcast', 'PRESS', None, None, None),
+        ('collapse', 'collapse', 'PRESS', True, None, None),
+        ('uncollapse', 'collapse', 'PRESS', False, None, None),
+        ('first', 'up', 'PRESS', False, True, None),
+        ('previous', 'up', 'PRESS', False, False, None),
+        ('last', 'down', 'PRESS', False, True, None),
+        ('next', 'down', 'PRESS', False, False, None),
+    ]
+
     # Const
     # Default modal editing mode.
     __DEFAULT_MODE = 'ACTIONS'
@@ -78,6 +125,9 @@ class ModalClustersOperator(ModalInputOperator, ModifiersOperator):
     # Returned values that should trigger operator remove.
     __OPERATOR_REMOVE = [{'FINISHED'}, {'CANCELLED'}]
 
+    # Events that cancel operator with any event value.
+    __CANCEL_EVENTS = {'RIGHTMOUSE', 'ESC'}
+
     # Create draw handler.
     __UI = True
 
@@ -104,9 +154,7 @@ class ModalClustersOperator(ModalInputOperator, ModifiersOperator):
         """Method that is initiated every frame or whatever."""
 
         # Exit out of editor mode or finish operator.
-        if (event.type == self.__emtk_kbs['exit']
-                or event.type == 'LEFTMOUSE')\
-                and event.value == 'PRESS':
+        if (event.type, event.value) in self.__exit_events:
             if self.mode != self.__DEFAULT_MODE:
                 self.emtk_modifier_update(context)
                 self.mode = self.__DEFAULT_MODE
@@ -115,7 +163,7 @@ class ModalClustersOperator(ModalInputOperator, ModifiersOperator):
                 return {'FINISHED'}
 
         # Cancell.
-        elif event.type in {'RIGHTMOUSE', 'ESC'}:
+        elif event.type in self.__CANCEL_EVENTS:
             self.clear(context)
             return {'CANCELLED'}
 
@@ -136,18 +184,14 @@ class ModalClustersOperator(ModalInputOperator, ModifiersOperator):
                 self.clear(context)
                 return a
 
-        # Redraw UI
-        if self.__UI:
-            context.area.tag_redraw()
-        if self.__UI_STATUSBAR:
-            context.workspace.status_text_set()
-
         # Modal method.
         if self.mode == 'ACTIONS':
             a = self.__modal_actions(context, event)
             if a in self.__OPERATOR_REMOVE:
                 self.clear(context)
                 return a
+            elif a:
+                self.__redraw_scheduler.touch()
 
         # Modal method.
         elif self.mode == 'EDITOR':
@@ -158,6 +202,9 @@ class ModalClustersOperator(ModalInputOperator, ModifiersOperator):
         else:
             raise ValueError
 
+        # Redraw UI
+        self.__update_ui(context)
+
         return {'RUNNING_MODAL'}
 
     def invoke(self, context, event):
@@ -165,12 +212,28 @@ class ModalClustersOperator(ModalInputOperator, ModifiersOperator):
 
         self.mode = self.__DEFAULT_MODE
         self.__selecting_clusters = False
+        self.__shortcuts_held = False
         self.first_x = event.mouse_x
         self.first_y = event.mouse_y
 
+        # Compile actions mappings.
+        self.__actions_dispatch = EventDispatchTable()
+        self.__build_actions_dispatch()
+
         # Operator-specific invoke
         self.emtk_operator_inv(context, event)
 
+        addon_prefs = bpy.context.preferences.addons['emtk'].preferences
+
+        # Redraw UI only when something changed.
+        self.__redraw_scheduler = RedrawScheduler(
+            addon_prefs.overlay_max_refresh_rate)
+
+        # Overlay, statusbar or both.
+        feedback = addon_prefs.operator_feedback
+        self.__UI = self.__UI and feedback != 'STATUSBAR'
+        self.__UI_STATUSBAR = self.__UI_STATUSBAR or feedback != 'OVERLAY'
+
         # Add UI.
         if self.__UI:
             logger.info("EMTK UI is created")
@@ -180,23 +243,27 @@ class ModalClustersOperator(ModalInputOperator, ModifiersOperator):
                 'WINDOW', 'POST_PIXEL')
             context.area.tag_redraw()
 
+        # Set statusbar text only when it changed.
+        if self.__UI_STATUSBAR:
+            self.__status_scheduler = StatusTextScheduler()
+            self.__status_version = None
+
+        # Timer that allows to push throttled state changes.
+        # Only exists while there are changes waiting for it.
+        self.__redraw_timer = None
+
         # TODO: this should be in lib
-        # Create backup collection.
-        addon_prefs = bpy.context.preferences.addons['emtk'].preferences
+        # Create backup store.
         b = addon_prefs.backup_mesh_on_modifier_apply_remove
         self.backup_mesh_on_modifier_apply_remove = b
         if b:
             c = addon_prefs.backup_collection_name
             self.backup_collection_name = c
-
-            # TODO: different collections for different objects in
-            # that backup collection.
-            if c not in bpy.data.collections:
-                backups = bpy.data.collections.new(name=c)
-                bpy.context.scene.collection.children.link(backups)
+            budget = addon_prefs.backup_memory_budget * 1024 * 1024
+            if addon_prefs.backup_mode == 'ARRAYS':
+                self.mesh_backups = ArrayMeshBackupStore(budget)
             else:
-                backups = bpy.data.collections[c]
-            self.backup_collection = backups
+                self.mesh_backups = MeshBackupStore(c, budget)
 
         # Create instances of ModifierList.
         result = self.create_objects_modifiers_lists(context)
@@ -205,266 +272,396 @@ class ModalClustersOperator(ModalInputOperator, ModifiersOperator):
             self.clear(context)
             return {'FINISHED'}
 
+        # Cached list can have selection from previous call.
+        self.__stop_selecting_clusters()
+
+        # {ModifiersList: names of modifiers which state should be saved}
+        self.__dirty_modifiers = {}
+
+        # ModifiersLists which clusters were constructed, deconstructed,
+        # moved or renamed.
+        self.__clusters_dirty = set()
+
+        # {id of ModifiersList: {(cluster name, type): cluster}}
+        self.__broadcast = addon_prefs.broadcast_edits
+        self.__broadcast_index = {}
+
         # Trigger active modifier change
         self.emtk_modifier_update(context)
+        self.__update_ui(context)
 
         logger.info("Finished initializing operator")
 
+        # Save generated shortcuts after operator finished.
+        # Released in clear.
+        hold_shortcuts_flush()
+        self.__shortcuts_held = True
+
+        # Changes made by operator don't make saved state stale.
+        # Ended in clear.
+        begin_state_editing(self)
+
         context.window_manager.modal_handler_add(self)
         return {'RUNNING_MODAL'}
 
+    # Mappings
+
+    def get_emtk_kbs(self) -> dict:
+        """Returns copy of actions mappings."""
+        return dict(self.__emtk_kbs)
+
+    def set_emtk_kbs(self, mappings: dict) -> None:
+        """Updates actions mappings and recompiles dispatch table."""
+        if not isinstance(mappings, dict):
+            raise TypeError
+        for x in mappings:
+            if x not in self.__emtk_kbs:
+                raise KeyError(f'No mapping {x}')
+        kbs = dict(self.__emtk_kbs)
+        kbs.update(mappings)
+        self.__emtk_kbs = kbs
+        self.__build_actions_dispatch()
+
+    def __build_actions_dispatch(self) -> None:
+        """Compiles actions mappings into dispatch table.
+
+        Should only be used on invoke and after mappings changed.
+        """
+        handlers = {
+            'visibility_render': self.__action_visibility_render,
+            'visibility_viewport': self.__action_visibility_viewport,
+            'visibility_on_cage': self.__action_visibility_on_cage,
+            'visibility_editmode': self.__action_visibility_editmode,
+            'sort': self.__action_sort,
+            'add_new': self.__action_add_new,
+            'apply_selection': self.__action_apply_selection,
+            'apply': self.__action_apply,
+            'deconstruct': self.__action_deconstruct,
+            'construct': self.__action_construct,
+            'construct_no_selection': self.__action_construct_no_selection,
+            'toggle_selection': self.__action_toggle_selection,
+            'remove_selection': self.__action_remove_selection,
+            'remove': self.__action_remove,
+            'move_up_selection': self.__action_move_up_selection,
+            'move_up': self.__action_move_up,
+            'move_down_selection': self.__action_move_down_selection,
+            'move_down': self.__action_move_down,
+            'broadcast': self.__action_broadcast,
+            'collapse': self.__action_collapse,
+            'uncollapse': self.__action_uncollapse,
+            'first': self.__action_first,
+            'previous': self.__action_previous,
+            'last': self.__action_last,
+            'next': self.__action_next,
+        }
+        self.__actions_dispatch.build(
+            self._EMTK_ACTIONS, self.__emtk_kbs, handlers)
+        self.__exit_events = {(self.__emtk_kbs['exit'], 'PRESS'),
+                              ('LEFTMOUSE', 'PRESS')}
+
     # Modal actions.
 
     def __modal_actions(self, context, event):
         """This method is used for general modifiers stack editing."""
 
-        layer = self.m_list.get_layer()
-        cluster = self.m_list.get_cluster()
+        handler = self.__actions_dispatch.get(
+            event, self.__selecting_clusters)
+        if handler is None:
+            return False
+        result = handler(context, event)
+        if result is None:
+            return True
+        return result
 
-        # Modifier visibility
-        if (event.type == self.__emtk_kbs['visibility_1'])\
-                & (event.value == 'PRESS'):
-            if event.shift:
-                if self.__selecting_clusters:
-                    for x in layer.get_selection():
-                        x.toggle_this_cluster_visibility(
-                            [True, False, False, False])
-                else:
-                    cluster.toggle_this_cluster_visibility(
-                        [True, False, False, False])
-            else:
-                if self.__selecting_clusters:
-                    for x in layer.get_selection():
-                        x.toggle_this_cluster_visibility(
-                            [False, True, False, False])
-                else:
-                    cluster.toggle_this_cluster_visibility(
-                        [False, True, False, False])
-
-        # Modifier visibility 2
-        elif (event.type == self.__emtk_kbs['visibility_2'])\
-                & (event.value == 'PRESS'):
-            if event.shift:
-                if self.__selecting_clusters:
-                    for x in layer.get_selection():
-                        cluster.toggle_this_cluster_visibility(
-                            [False, False, False, True])
-                else:
-                    cluster.toggle_this_cluster_visibility(
-                        [False, False, False, True])
-            else:
-                if self.__selecting_clusters:
-                    for x in layer.get_selection():
-                        cluster.toggle_this_cluster_visibility(
-                            [False, False, True, False])
-                else:
-                    cluster.toggle_this_cluster_visibility(
-                        [False, False, False, True])
-
-        # Sort modifiers
-        elif (event.type == self.__emtk_kbs['sort'])\
-                & (event.value == 'PRESS'):
-            layer.apply_sorting_rules()
-
-        # Duplicate cluster modifiers and parse
-        elif (event.type == self.__emtk_kbs['add_new'])\
-                & (event.value == 'PRESS'):
+    # Modifier visibility
 
-            if not self.__EMTKM:
-                x = self.m_list.create_modifier(
-                    self._DEFAULT_M_NAME, self._DEFAULT_M_TYPE)
-                self.m_list.active = x
-            else:
-                self.m_list.duplicate(cluster)
+    def __action_visibility_render(self, context, event):
+        for x in self.get_broadcast_clusters(self.__get_clusters()):
+            x.toggle_this_cluster_visibility([True, False, False, False])
+        self.mark_clusters_dirty(self.__get_clusters())
 
-            # Trigger active modifier change
-            self.emtk_modifier_update(context)
+    def __action_visibility_viewport(self, context, event):
+        for x in self.get_broadcast_clusters(self.__get_clusters()):
+            x.toggle_this_cluster_visibility([False, True, False, False])
+        self.mark_clusters_dirty(self.__get_clusters())
 
-        # Apply active cluster
-        elif (event.type == self.__emtk_kbs['apply_remove'])\
-                & event.shift & (event.value == 'PRESS'):
+    # Modifier visibility 2
 
-            # Remove cluster.
-            if self.__selecting_clusters:
-                layer.apply_clusters_selection()
-            else:
-                layer.apply(cluster)
+    def __action_visibility_on_cage(self, context, event):
+        for x in self.get_broadcast_clusters(self.__get_clusters()):
+            x.toggle_this_cluster_visibility([False, False, False, True])
+        self.mark_clusters_dirty(self.__get_clusters())
 
-            self.__stop_selecting_clusters()
-            # Check if it was last actual modifier.
-            # If so, finish operator.
-            if len(self.m_list.all_modifiers()) == 0:
-                self.clear(context)
-                return {'FINISHED'}
+    def __action_visibility_editmode(self, context, event):
+        for x in self.get_broadcast_clusters(self.__get_clusters()):
+            x.toggle_this_cluster_visibility([False, False, True, False])
+        self.mark_clusters_dirty(self.__get_clusters())
 
-            # Trigger active modifier change.
-            self.emtk_modifier_update(context)
+    # Sort modifiers
 
-        # Deconstruct cluster.
-        elif (event.type == self.__emtk_kbs['construct_deconstruct'])\
-                & event.shift & (event.value == 'PRESS'):
-
-            for x in self.__get_clusters():
-                if layer.deconstruct(x):
-                    self.report({'INFO'}, "Deconstructed cluster")
-                else:
-                    self.report({'ERROR'}, "Cant deconstruct cluster")
-
-        # Construct cluster from selection.
-        elif (event.type == self.__emtk_kbs['construct_deconstruct'])\
-                & (event.value == 'PRESS'):
-
-            if self.__selecting_clusters:
-                if layer.construct_cluster_from_selection():
-                    self.report({'INFO'}, "Constructed cluster.")
-                else:
-                    self.report({'ERROR'}, "Cant create cluster.")
-                self.__stop_selecting_clusters()
-            else:
-                self.report({'ERROR'}, "No clustes selected.")
+    def __action_sort(self, context, event):
+        self.m_list.get_layer().apply_sorting_rules()
 
-        # Toggle selection.
-        elif (event.type == self.__emtk_kbs['toogle_selection'])\
-                & (event.value == 'PRESS'):
+    # Duplicate cluster modifiers and parse
 
-            # Toggle selecting clusters.
-            if self.__selecting_clusters:
-                self.__stop_selecting_clusters()
-            else:
-                self.__start_selecting_clusters()
+    def __action_add_new(self, context, event):
+        active = self.m_list.get_cluster()
+        if not self.__EMTKM:
+            x = self.m_list.create_modifier(
+                self._DEFAULT_M_NAME, self._DEFAULT_M_TYPE)
+            self.m_list.active = x
+        else:
+            self.m_list.duplicate(self.m_list.get_cluster())
+
+        # Patch state with new cluster.
+        self.__stack_changed(context, StackChange.INSERTED,
+                             [self.m_list.get_cluster()], active)
+
+    # Apply active cluster
+
+    def __action_apply_selection(self, context, event):
+        self.__backup_mesh()
+        clusters = self.__get_clusters()
+        active = self.m_list.get_cluster()
+        self.m_list.get_layer().apply_clusters_selection()
+        return self.__after_apply(context, clusters, active)
+
+    def __action_apply(self, context, event):
+        self.__backup_mesh()
+        active = self.m_list.get_cluster()
+        self.m_list.get_layer().apply(active)
+        return self.__after_apply(context, [active], active)
+
+    def __after_apply(self, context, clusters, active):
+        self.__stop_selecting_clusters()
+
+        # Check if it was last actual modifier.
+        # If so, finish operator.
+        if len(self.m_list.all_modifiers()) == 0:
+            self.clear(context)
+            return {'FINISHED'}
 
-        # Remove active cluster.
-        elif (event.type == self.__emtk_kbs['apply_remove'])\
-                & (event.value == 'PRESS'):
-            logger.info('Removing cluster')
+        # Patch state without applied clusters.
+        self.__stack_changed(context, StackChange.REMOVED, clusters, active)
 
-            # Remove cluster.
-            if self.__selecting_clusters is True:
-                layer.remove_clusters_selection()
+    # Deconstruct cluster.
+
+    def __action_deconstruct(self, context, event):
+        layer = self.m_list.get_layer()
+        active = self.m_list.get_cluster()
+        removed = []
+        for x in self.__get_clusters():
+            if layer.deconstruct(x):
+                removed.append(x)
+                self.report({'INFO'}, "Deconstructed cluster")
             else:
-                layer.remove(cluster)
+                self.report({'ERROR'}, "Cant deconstruct cluster")
+
+        # Patch state without deconstructed clusters.
+        if len(removed) > 0:
+            self.__stack_changed(
+                context, StackChange.REMOVED, removed, active)
 
+    # Construct cluster from selection.
+
+    def __action_construct(self, context, event):
+        active = self.m_list.get_cluster()
+        if self.m_list.get_layer().construct_cluster_from_selection():
+            self.report({'INFO'}, "Constructed cluster.")
             self.__stop_selecting_clusters()
 
-            # Trigger active modifier change.
-            self.emtk_modifier_update(context)
+            # Patch state with new cluster.
+            self.__stack_changed(context, StackChange.INSERTED,
+                                 [self.m_list.get_cluster()], active)
+        else:
+            self.report({'ERROR'}, "Cant create cluster.")
+            self.__stop_selecting_clusters()
+
+    def __action_construct_no_selection(self, context, event):
+        self.report({'ERROR'}, "No clustes selected.")
 
-        # Move modifier up.
-        elif (event.type == self.__emtk_kbs['up'])\
-                & event.shift & (event.value == 'PRESS'):
-            logger.info('Moving cluster')
+    # Toggle selection.
 
-            # Move modifier.
-            if self.__selecting_clusters:
-                layer.move_up_selection()
+    def __action_toggle_selection(self, context, event):
+        if self.__selecting_clusters:
+            self.__stop_selecting_clusters()
+        else:
+            self.__start_selecting_clusters()
+
+    # Remove active cluster.
+
+    def __action_remove_selection(self, context, event):
+        logger.info('Removing cluster')
+        self.__backup_mesh()
+        clusters = self.__get_clusters()
+        active = self.m_list.get_cluster()
+        self.m_list.get_layer().remove_clusters_selection()
+        self.__after_remove(context, clusters, active)
+
+    def __action_remove(self, context, event):
+        logger.info('Removing cluster')
+        self.__backup_mesh()
+        active = self.m_list.get_cluster()
+        self.m_list.get_layer().remove(active)
+        self.__after_remove(context, [active], active)
+
+    def __after_remove(self, context, clusters, active):
+        self.__stop_selecting_clusters()
+
+        # Patch state without removed clusters.
+        self.__stack_changed(context, StackChange.REMOVED, clusters, active)
+
+    # Move modifier up.
+
+    def __action_move_up_selection(self, context, event):
+        logger.info('Moving cluster')
+        clusters = self.__get_clusters()
+        active = self.m_list.get_cluster()
+        self.m_list.get_layer().move_up_selection()
+
+        # Patch state with moved clusters.
+        self.__stack_changed(context, StackChange.MOVED, clusters, active)
+
+    def __action_move_up(self, context, event):
+        logger.info('Moving cluster')
+        active = self.m_list.get_cluster()
+        self.m_list.get_layer().move_up(active)
+
+        # Patch state with moved cluster.
+        self.__stack_changed(context, StackChange.MOVED, [active], active)
+
+    # Move modifier down.
+
+    def __action_move_down_selection(self, context, event):
+        logger.info('Moving cluster')
+        clusters = self.__get_clusters()
+        active = self.m_list.get_cluster()
+        self.m_list.get_layer().move_down_selection()
+
+        # Patch state with moved clusters.
+        self.__stack_changed(context, StackChange.MOVED, clusters, active)
+
+    def __action_move_down(self, context, event):
+        logger.info('Moving cluster')
+        active = self.m_list.get_cluster()
+        self.m_list.get_layer().move_down(active)
+
+        # Patch state with moved cluster.
+        self.__stack_changed(context, StackChange.MOVED, [active], active)
+
+    # Toggle broadcasting edits to other selected objects.
+
+    def __action_broadcast(self, context, event):
+        self.__broadcast = not self.__broadcast
+        if self.__broadcast:
+            self.report({'INFO'}, "Broadcasting edits to selected objects.")
+        else:
+            self.report({'INFO'}, "Editing active object only.")
+
+        # Trigger active modifier change.
+        self.emtk_modifier_update(context)
+
+    # Collapse cluster.
+
+    def __action_collapse(self, context, event):
+        logger.info('Collapse toggle cluster')
+        self.__stop_selecting_clusters()
+
+        layer = self.m_list.get_layer()
+        cluster = self.m_list.get_cluster()
+        if (cluster.instance_data['collapsed'] is False)\
+                & (cluster.has_clusters() is False):
+            cluster.instance_data['collapsed'] = True
+        elif (cluster.instance_data['collapsed'] is True)\
+                & (cluster.has_clusters() is False):
+            layer.instance_data['collapsed'] = True
+        elif (cluster.instance_data['collapsed'] is True)\
+                & (cluster.has_clusters() is True):
+            layer.instance_data['collapsed'] = True
+
+        # Trigger active modifier change.
+        self.emtk_modifier_update(context)
+
+    # Uncollapse cluster.
+
+    def __action_uncollapse(self, context, event):
+        logger.info('Collapse toggle cluster')
+        self.__stop_selecting_clusters()
+
+        self.m_list.get_cluster().instance_data['collapsed'] = False
+
+        # Trigger active modifier change.
+        self.emtk_modifier_update(context)
+
+    # Scroll through modifiers up.
+
+    def __action_first(self, context, event):
+        layer = self.m_list.get_layer()
+
+        # Only change modifier if there is more than one available.
+        if len(layer) > 1:
+            if not self.__EMTKM:
+                x = []
+                for y in layer:
+                    if y.type == self._DEFAULT_M_TYPE:
+                        x.append(y)
+                layer.active = x[0]
             else:
-                layer.move_up(cluster)
+                layer.active = layer[0]
 
-            # Trigger active modifier change.
-            self.emtk_modifier_update(context)
+        # Trigger active modifier change.
+        self.emtk_modifier_update(context)
 
-        # Move modifier down.
-        elif (event.type == self.__emtk_kbs['down'])\
-                & event.shift & (event.value == 'PRESS'):
-            logger.info('Moving cluster')
+    def __action_previous(self, context, event):
+        layer = self.m_list.get_layer()
+        cluster = self.m_list.get_cluster()
 
-            # Move modifier.
-            if self.__selecting_clusters:
-                layer.move_down_selection()
+        # Only change modifier if there is more than one available.
+        if len(layer) > 1:
+            if not self.__EMTKM:
+                layer.active = layer.iterate(
+                    cluster, 'UP', self._DEFAULT_M_TYPE)
             else:
-                layer.move_down(cluster)
+                layer.active = layer.iterate(cluster, 'UP', loop=True)
 
-            # Trigger active modifier change.
-            self.emtk_modifier_update(context)
+        # Trigger active modifier change.
+        self.emtk_modifier_update(context)
 
-        # Collapse cluster.
-        elif (event.type == self.__emtk_kbs['collapse'])\
-                & (event.value == 'PRESS'):
-            logger.info('Collapse toggle cluster')
-            self.__stop_selecting_clusters()
+    # Scroll through modifiers down.
+
+    def __action_last(self, context, event):
+        layer = self.m_list.get_layer()
 
-            # Collapse cluster.
-            if event.shift:
-                if (cluster.instance_data['collapsed'] is False)\
-                        & (cluster.has_clusters() is False):
-                    cluster.instance_data['collapsed'] = True
-                elif (cluster.instance_data['collapsed'] is True)\
-                        & (cluster.has_clusters() is False):
-                    layer.instance_data['collapsed'] = True
-                elif (cluster.instance_data['collapsed'] is True)\
-                        & (cluster.has_clusters() is True):
-                    layer.instance_data['collapsed'] = True
-
-            # Uncollapse cluster.
+        # Only change modifier if there is more than one available.
+        if len(layer) > 1:
+            if not self.__EMTKM:
+                x = []
+                for y in layer:
+                    if y.type == self._DEFAULT_M_TYPE:
+                        x.append(y)
+                layer.active = x[-1]
             else:
-                cluster.instance_data['collapsed'] = False
+                layer.active = layer[-1]
 
             # Trigger active modifier change.
             self.emtk_modifier_update(context)
 
-            self.__stop_selecting_clusters()
+    def __action_next(self, context, event):
+        layer = self.m_list.get_layer()
+        cluster = self.m_list.get_cluster()
 
-        # Scroll through modifiers up.
-        elif (event.type == self.__emtk_kbs['up'])\
-                & (event.value == 'PRESS'):
-
-            # Only change modifier if there is more than one available.
-            if len(layer) > 1:
-
-                # First modifier.
-                if event.ctrl:
-                    if not self.__EMTKM:
-                        x = []
-                        for y in layer:
-                            if y.type == self._DEFAULT_M_TYPE:
-                                x.append(y)
-                        layer.active = x[0]
-                    else:
-                        layer.active = layer[0]
-
-                # Previous modifier.
-                else:
-                    if not self.__EMTKM:
-                        layer.active = layer.iterate(
-                            cluster, 'UP', self._DEFAULT_M_TYPE)
-                    else:
-                        layer.active = layer.iterate(cluster, 'UP', loop=True)
+        # Only change modifier if there is more than one available.
+        if len(layer) > 1:
+            if not self.__EMTKM:
+                layer.active = layer.iterate(
+                    cluster, 'DOWN', self._DEFAULT_M_TYPE)
+            else:
+                layer.active = layer.iterate(
+                    cluster, 'DOWN', loop=True)
 
             # Trigger active modifier change.
             self.emtk_modifier_update(context)
 
-        # Scroll through modifiers down.
-        elif (event.type == self.__emtk_kbs['down'])\
-                & (event.value == 'PRESS'):
-
-            # Only change modifier if there is more than one available.
-            if len(layer) > 1:
-                # Last modifier.
-                if event.ctrl:
-                    if not self.__EMTKM:
-                        x = []
-                        for y in layer:
-                            if y.type == self._DEFAULT_M_TYPE:
-                                x.append(y)
-                        layer.active = x[-1]
-                    else:
-                        layer.active = layer[-1]
-
-                # Next modifier.
-                else:
-                    if not self.__EMTKM:
-                        layer.active = layer.iterate(
-                            cluster, 'DOWN', self._DEFAULT_M_TYPE)
-                    else:
-                        layer.active = layer.iterate(
-                            cluster, 'DOWN', loop=True)
-
-                # Trigger active modifier change.
-                self.emtk_modifier_update(context)
-        else:
-            return False
-        return True
-
     # TODO: rename this methods.
     # Methods reserved for operators.
 
@@ -492,6 +689,30 @@ class ModalClustersOperator(ModalInputOperator, ModifiersOperator):
         """
         return
 
+    def emtk_stack_changed(self, context, change):
+        """Operator-specific stack change.
+
+        This method is called every time action changes modifiers
+        stack. change is StackChange instance. By default, state is
+        rebuilt the same way as after active modifier change.
+        """
+        self.emtk_modifier_update(context)
+
+    def emtk_ui_state(self, context):
+        """Operator-specific UI state.
+
+        Should return hashable object that is different every time
+        UI should be redrawn. Actions always trigger redraw.
+        """
+        return (self.mode, self.__selecting_clusters, self.__broadcast)
+
+    def emtk_status_line(self, context) -> str:
+        """Operator-specific statusbar line.
+
+        Called once per UI state version, if statusbar is used.
+        """
+        return f"{self.mode} | {self.m_list.get_cluster().name}"
+
     def emtk_operator_invoke(self, context, event):
         """Operator-specific invoke method.
 
@@ -516,6 +737,10 @@ class ModalClustersOperator(ModalInputOperator, ModifiersOperator):
 
         # Remove ui
         context.workspace.status_text_set(None)
+        try:
+            self.__remove_redraw_timer(context)
+        except AttributeError:
+            pass
         if self.__UI:
             bpy.types.SpaceView3D.draw_handler_remove(
                 self.emtk_ui_draw_handler, 'WINDOW')
@@ -528,13 +753,24 @@ class ModalClustersOperator(ModalInputOperator, ModifiersOperator):
         already_removed = False
 
         # TODO: should not be here.
-        if bpy.context.preferences.addons['emtk'].preferences.save_clusters:
+        addon_prefs = bpy.context.preferences.addons['emtk'].preferences
+        if addon_prefs.save_clusters:
             try:
-                self.m_list.save_modifiers_state()
-                self.m_list.save_clusters_state()
-                logger.info("Saved modifiers and clusters.")
+                self.__save_state(addon_prefs.deferred_save_clusters)
             except AttributeError:
                 already_removed = True
+        end_state_editing(self)
+
+        # Save generated shortcuts.
+        if self.__shortcuts_held:
+            self.__shortcuts_held = False
+            release_shortcuts_flush()
+
+        # Keep edited lists for next operator call.
+        try:
+            self.store_objects_modifiers_lists()
+        except AttributeError:
+            pass
 
         try:
             del(self.selected_objects)
@@ -551,8 +787,154 @@ class ModalClustersOperator(ModalInputOperator, ModifiersOperator):
 
         logger.info("Modal operator finished.")
 
+    # Broadcast
+
+    @property
+    def broadcast(self) -> bool:
+        """Edits are replayed on clusters of other selected objects."""
+        return self.__broadcast
+
+    def get_broadcast_clusters(self, clusters) -> list:
+        """Returns clusters, and clusters with same name and type
+        on other selected objects, if broadcasting.
+        """
+        if not isinstance(clusters, list):
+            clusters = [clusters]
+        if not self.__broadcast:
+            return clusters
+
+        return [x[1] for x in self.__get_broadcast_targets(clusters)]
+
+    def __get_broadcast_targets(self, clusters) -> list:
+        """Returns [(ModifiersList, cluster)] list for clusters of
+        active object and clusters they are broadcasted to.
+        """
+        result = [(self.m_list, x) for x in clusters]
+        if not self.__broadcast:
+            return result
+
+        for m_list in self.selected_objects:
+            if m_list is self.m_list:
+                continue
+            index = self.__get_broadcast_index(m_list)
+            for x in clusters:
+                y = index.get((x.name, x.type))
+                if y is not None:
+                    result.append((m_list, y))
+        return result
+
+    def __get_broadcast_index(self, m_list) -> dict:
+        """Returns {(cluster name, type): cluster} dict.
+
+        Only active object stack is changed by actions, so
+        other objects indices are never invalidated.
+        """
+        x = self.__broadcast_index.get(id(m_list))
+        if x is None:
+            x = {}
+            for y in m_list.all_clusters():
+                x.setdefault((y.name, y.type), y)
+            self.__broadcast_index.update({id(m_list): x})
+        return x
+
+    # Saving state
+
+    def mark_clusters_dirty(self, clusters) -> None:
+        """Marks clusters state to be saved on operator finish.
+
+        Clusters they are broadcasted to are marked too.
+        """
+        if not isinstance(clusters, list):
+            clusters = [clusters]
+        for m_list, x in self.__get_broadcast_targets(clusters):
+            names = self.__dirty_modifiers.setdefault(m_list, set())
+            for mod in x.all_modifiers():
+                names.add(mod.name)
+
+    def __save_state(self, deferred: bool) -> None:
+        """Saves state of changed clusters of all edited objects."""
+        m_lists = {self.m_list}
+        m_lists.update(self.__dirty_modifiers)
+        m_lists.update(self.__clusters_dirty)
+        for m_list in m_lists:
+            dirty = self.__dirty_modifiers.get(m_list, set())
+            clusters_dirty = m_list in self.__clusters_dirty
+            if deferred:
+                save_dirty_state_deferred(m_list, dirty, clusters_dirty)
+            else:
+                save_dirty_state(m_list, dirty, clusters_dirty)
+        if deferred:
+            logger.info("Scheduled saving modifiers and clusters.")
+        else:
+            logger.info("Saved modifiers and clusters.")
+        self.__dirty_modifiers = {}
+        self.__clusters_dirty = set()
+
+    # Backup
+
+    def __backup_mesh(self) -> None:
+        """Stores active object backup, if enabled in preferences."""
+        if self.backup_mesh_on_modifier_apply_remove:
+            self.mesh_backups.backup(self.m_list._object)
+
+    # UI utils
+
+    def get_ui_version(self) -> int:
+        """Returns version of UI state.
+
+        It is changed every time UI should be redrawn.
+        """
+        return self.__redraw_scheduler.version
+
+    def __update_ui(self, context) -> None:
+        """Redraws UI, if UI state changed."""
+        self.__redraw_scheduler.update(self.emtk_ui_state(context))
+        if self.__UI:
+            self.__redraw_scheduler.redraw(context.area)
+        if self.__UI_STATUSBAR:
+            self.__update_status(context)
+
+        # Wake modal only to flush throttled changes.
+        pending = self.__UI and self.__redraw_scheduler.pending
+        if self.__UI_STATUSBAR:
+            pending = pending or self.__status_scheduler.pending
+        if pending and self.__redraw_timer is None:
+            self.__redraw_timer = context.window_manager.event_timer_add(
+                self.__redraw_scheduler.interval, window=context.window)
+        elif not pending:
+            self.__remove_redraw_timer(context)
+
+    def __remove_redraw_timer(self, context) -> None:
+        if self.__redraw_timer is not None:
+            context.window_manager.event_timer_remove(self.__redraw_timer)
+            self.__redraw_timer = None
+
+    def __update_status(self, context) -> None:
+        """Pushes status line, if it changed.
+
+        Line is composed only once per UI state version.
+        """
+        version = self.__redraw_scheduler.version
+        if version != self.__status_version:
+            self.__status_version = version
+            self.__status_scheduler.update(self.emtk_status_line(context))
+        self.__status_scheduler.push(context.workspace)
+
     # Clusters selection utils
 
+    def __stack_changed(self, context, kind, clusters, active) -> None:
+        """Creates StackChange and passes it to operator.
+
+        active is active cluster before change.
+        """
+        change = StackChange(
+            kind, clusters, self.m_list.get_cluster() is not active)
+        logger.debug(change)
+
+        # Clusters structure is saved separately from modifiers.
+        self.__clusters_dirty.add(self.m_list)
+        self.emtk_stack_changed(context, change)
+
     def __stop_selecting_clusters(self) -> None:
         self.__selecting_clusters = False
         layer = self.m_list.get_layer()
@@ -0,0 +1,120 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# logger.setLevel(logging.DEBUG)
+
+
+class CoalescedMouseEvent():
+    """
+    Copy of MOUSEMOVE event with mouse delta of all
+    events that were coalesced into it.
+
+    Blender events can not be stored after modal method returns,
+    so every used attribute is copied.
+    """
+
+    __EVENT_ATTRS = ['type', 'value', 'shift', 'ctrl', 'alt', 'oskey',
+                     'mouse_x', 'mouse_y',
+                     'mouse_region_x', 'mouse_region_y']
+
+    def __init__(self, event, delta_x: int, delta_y: int):
+        for x in self.__EVENT_ATTRS:
+            setattr(self, x, getattr(event, x, None))
+        self.delta_x = delta_x
+        self.delta_y = delta_y
+        self.mouse_prev_x = self.mouse_x - delta_x
+        self.mouse_prev_y = self.mouse_y - delta_y
+
+
+class MouseDeltaCoalescer():
+    """
+    Accumulates mouse deltas between ticks, so that property
+    can be written once per tick instead of once per MOUSEMOVE.
+
+    Tick interval adapts to measured evaluation time, so that
+    evaluation takes no more than load part of main thread time.
+    """
+
+    def __init__(self,
+                 min_interval: float = 1 / 60,
+                 max_interval: float = 0.25,
+                 load: float = 0.5):
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError
+        if not 0 < load <= 1:
+            raise ValueError
+
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.load = load
+        self.interval = min_interval
+
+        # Last evaluation time in seconds.
+        self.evaluation_time = 0.0
+
+        self.__event = None
+        self.__delta_x = 0
+        self.__delta_y = 0
+        self.__last_tick = 0.0
+
+    @property
+    def pending(self) -> bool:
+        """There are mouse deltas that were not popped yet."""
+        return self.__event is not None
+
+    def add(self, event) -> None:
+        """Adds MOUSEMOVE event delta."""
+        self.__delta_x += event.mouse_x - event.mouse_prev_x
+        self.__delta_y += event.mouse_y - event.mouse_prev_y
+        self.__event = CoalescedMouseEvent(
+            event, self.__delta_x, self.__delta_y)
+
+    def ready(self) -> bool:
+        """Tick interval passed since last pop."""
+        return time.perf_counter() - self.__last_tick >= self.interval
+
+    def pop(self):
+        """Returns coalesced event, or None if nothing was added."""
+        event = self.__event
+        self.__event = None
+        self.__delta_x = 0
+        self.__delta_y = 0
+        self.__last_tick = time.perf_counter()
+        return event
+
+    def measure(self, evaluation_time: float) -> None:
+        """Adapts tick interval to evaluation time in seconds."""
+        self.evaluation_time = evaluation_time
+        x = evaluation_time / self.load
+
+        # Smooth interval changes.
+        x = (self.interval + x) / 2
+        self.interval = min(max(x, self.min_interval), self.max_interval)
+        logger.debug(f'Evaluation {evaluation_time}, tick {self.interval}')
+
+    def clear(self) -> None:
+        self.__event = None
+        self.__delta_x = 0
+        self.__delta_y = 0
+        self.interval = self.min_interval
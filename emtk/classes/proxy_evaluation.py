@@ -0,0 +1,100 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import logging
+
+from libemtk.utils.modifiers import get_modifier_state
+
+from ..utils.evaluation import get_modifiers_cost
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# logger.setLevel(logging.DEBUG)
+
+
+class ProxyEvaluation():
+    """
+    Temporarily degrades expensive modifiers below edited ones,
+    so that interactive editing evaluates faster.
+
+    Modifiers are degraded only if their cost, measured by
+    emtk.profile_clusters, is above threshold. Modifiers without
+    measured cost are never degraded, so nothing is measured while
+    editing. Original values are captured with get_modifier_state
+    and restored on stop.
+    """
+
+    # Props that are lowered instead of disabling modifier.
+    __REDUCED_PROPS = {
+        'SUBSURF': {'levels': 0},
+        'MULTIRES': {'levels': 0},
+    }
+
+    # Used for every other modifier type.
+    __DISABLED_PROPS = {'show_viewport': False}
+
+    def __init__(self):
+        # [[modifier, {prop name: original value}]]
+        self.__degraded = []
+
+    @property
+    def active(self) -> bool:
+        return len(self.__degraded) > 0
+
+    def start(self, modifiers, threshold: float) -> None:
+        """Degrades modifiers below edited modifiers.
+
+        threshold is cost in seconds.
+        """
+        self.stop()
+
+        # Group edited modifiers by object.
+        objects = {}
+        for x in modifiers:
+            objects.setdefault(x.id_data, []).append(x)
+
+        for obj, edited in objects.items():
+            i = min(list(obj.modifiers).index(x) for x in edited)
+            below = [x for x in obj.modifiers[i + 1:]
+                     if x not in edited and x.show_viewport]
+            if len(below) == 0:
+                continue
+            costs = get_modifiers_cost(obj, below)
+            for x in below:
+                if costs.get(x.name, 0.0) >= threshold:
+                    self.__degrade(x)
+        logger.debug(f'Degraded {len(self.__degraded)} modifiers.')
+
+    def stop(self) -> None:
+        """Restores all degraded modifiers."""
+        for mod, props in reversed(self.__degraded):
+            for x, y in props.items():
+                setattr(mod, x, y)
+        self.__degraded = []
+
+    def __degrade(self, mod) -> None:
+        state = get_modifier_state(mod)
+        props = self.__REDUCED_PROPS.get(mod.type, self.__DISABLED_PROPS)
+        original = {}
+        for x, y in props.items():
+            original.update({x: state[x]})
+        self.__degraded.append([mod, original])
+        for x, y in props.items():
+            setattr(mod, x, y)
+        logger.debug(f'Degraded {mod.name} {original}')
@@ -0,0 +1,94 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# logger.setLevel(logging.DEBUG)
+
+
+class RedrawScheduler():
+    """
+    Tags area redraw only when UI state changed, and
+    no more often than max_rate times per second.
+
+    version is incremented every time state changes and
+    can be used to invalidate anything that depends on UI state.
+    """
+
+    def __init__(self, max_rate: int = 30):
+        if not isinstance(max_rate, int):
+            raise TypeError
+        if max_rate <= 0:
+            raise ValueError
+
+        self.max_rate = max_rate
+        self.version = 0
+
+        # Last state that was compared.
+        self.__state = None
+
+        # State changed, but area was not redrawn yet.
+        self.__pending = True
+
+        # Time of last tag_redraw.
+        self.__last_redraw = 0.0
+
+    @property
+    def interval(self) -> float:
+        """Minimal time between two redraws in seconds."""
+        return 1.0 / self.max_rate
+
+    @property
+    def pending(self) -> bool:
+        return self.__pending
+
+    def update(self, state) -> bool:
+        """Compares state with previous one.
+
+        Returns True, if state version changed.
+        """
+        if state == self.__state:
+            return False
+        self.__state = state
+        self.touch()
+        return True
+
+    def touch(self) -> None:
+        """Changes state version without comparing state."""
+        self.version += 1
+        self.__pending = True
+
+    def redraw(self, area) -> bool:
+        """Tags area redraw, if state changed since last redraw.
+
+        Returns True, if area redraw was tagged.
+        """
+        if not self.__pending:
+            return False
+        t = time.perf_counter()
+        if t - self.__last_redraw < self.interval:
+            logger.debug('Redraw throttled.')
+            return False
+        self.__last_redraw = t
+        self.__pending = False
+        area.tag_redraw()
+        return True
@@ -0,0 +1,59 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import logging
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# logger.setLevel(logging.DEBUG)
+
+
+class StackChange():
+    """
+    Describes local change of modifiers stack made by
+    ModalClustersOperator action.
+
+    Used to patch cached state instead of rebuilding it.
+    """
+
+    INSERTED = 'INSERTED'
+    REMOVED = 'REMOVED'
+    MOVED = 'MOVED'
+    RENAMED = 'RENAMED'
+
+    __KINDS = {INSERTED, REMOVED, MOVED, RENAMED}
+
+    def __init__(self, kind: str, clusters: list, active_changed: bool):
+        if kind not in self.__KINDS:
+            raise ValueError
+        if not isinstance(clusters, list):
+            clusters = [clusters]
+
+        # Kind of change.
+        self.kind = kind
+
+        # Clusters that were inserted, removed, moved or renamed.
+        self.clusters = clusters
+
+        # Active cluster is not the same as before change.
+        self.active_changed = active_changed
+
+    def __repr__(self):
+        return f'StackChange({self.kind}, {len(self.clusters)} clusters, '\
+            f'active changed: {self.active_changed})'
@@ -0,0 +1,95 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# logger.setLevel(logging.DEBUG)
+
+
+class StatusTextScheduler():
+    """
+    Sets statusbar text only when it changed, and
+    no more often than max_rate times per second.
+
+    Every status_text_set redraws headers across the window,
+    so text is not pushed on every event.
+    """
+
+    def __init__(self, max_rate: int = 10):
+        if not isinstance(max_rate, int):
+            raise TypeError
+        if max_rate <= 0:
+            raise ValueError
+
+        self.max_rate = max_rate
+
+        # Text that was pushed to statusbar.
+        self.__text = None
+
+        # Text that is waiting to be pushed.
+        self.__pending = None
+
+        # Time of last status_text_set.
+        self.__last_push = 0.0
+
+    @property
+    def interval(self) -> float:
+        """Minimal time between two pushes in seconds."""
+        return 1.0 / self.max_rate
+
+    @property
+    def pending(self) -> bool:
+        return self.__pending is not None
+
+    def update(self, text: str) -> bool:
+        """Stores text, if it is different from pushed one.
+
+        Returns True, if text should be pushed.
+        """
+        if text == self.__text:
+            self.__pending = None
+            return False
+        self.__pending = text
+        return True
+
+    def push(self, workspace) -> bool:
+        """Sets statusbar text, if it changed since last push.
+
+        Returns True, if text was set.
+        """
+        if self.__pending is None:
+            return False
+        t = time.perf_counter()
+        if t - self.__last_push < self.interval:
+            logger.debug('Statusbar text throttled.')
+            return False
+        self.__last_push = t
+        self.__text = self.__pending
+        self.__pending = None
+        workspace.status_text_set(self.__text)
+        return True
+
+    def clear(self, workspace) -> None:
+        """Restores default statusbar."""
+        self.__text = None
+        self.__pending = None
+        workspace.status_text_set(None)
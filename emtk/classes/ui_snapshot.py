@@ -0,0 +1,68 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import collections
+import logging
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# logger.setLevel(logging.DEBUG)
+
+ClusterFlags = collections.namedtuple(
+    'ClusterFlags', ['has_clusters', 'tags', 'collapsed'])
+
+
+class UISnapshot():
+    """
+    State of modifiers list that overlay lines are generated from.
+
+    Created once per UI state version, so that selection
+    membership and clusters flags are not computed for every line.
+    """
+
+    def __init__(self, version, m_list, selection, costs: dict):
+        # UI state version snapshot was created for.
+        self.version = version
+
+        self.m_list = m_list
+        self.m_name = m_list.get_cluster().name
+        self.m_type = m_list.get_cluster().type
+
+        # Ids of selected clusters on active layer.
+        self.selection = {id(x) for x in selection}
+
+        # Profiled clusters costs, if any.
+        self.costs = costs
+
+        self.__flags = {}
+
+    def is_selected(self, cluster) -> bool:
+        return id(cluster) in self.selection
+
+    def get_flags(self, cluster) -> ClusterFlags:
+        """Returns cluster flags, computed on first use."""
+        flags = self.__flags.get(id(cluster))
+        if flags is None:
+            tags = cluster.get_this_cluster_tags()
+            if len(tags) == 0:
+                tags = ''
+            flags = ClusterFlags(cluster.has_clusters(), tags,
+                                 cluster.instance_data['collapsed'])
+            self.__flags.update({id(cluster): flags})
+        return flags
@@ -20,6 +20,7 @@
 import logging
 import math
 import string
+import time
 import typing
 
 try:
@@ -32,11 +33,15 @@ except ModuleNotFoundError:
     _WITH_BPY = False
 
 from libemtk.clusters.cluster_trait import ClusterTrait
-from libemtk.utils.modifier_prop_types import get_props_filtered_by_types
-from modal_shortcuts.shortcuts import (ModalShortcutsGroup,
-                                       generate_new_shortcut)
 
 from ..classes.editor import ModalClustersEditor
+from ..classes.mouse_delta_coalescer import MouseDeltaCoalescer
+from ..classes.proxy_evaluation import ProxyEvaluation
+from ..utils.batch_write import get_props_values, set_props_values
+from ..utils.evaluation import format_cost
+from ..utils.modifier_schema import (get_common_schema, get_enum_successor,
+                                     get_modifier_schema)
+from ..utils.shortcuts_index import get_or_generate_shortcuts
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -174,6 +179,9 @@ class AdaptiveModalEditor(ModalClustersEditor):
     # Property rna_type struct
     # self.__prop_def
 
+    # Property schema, resolved together with __prop_def
+    # self.__prop
+
     # Sets of modifier props names.
     # Modal editing prop only.
     # __kbs_modal = set()
@@ -199,6 +207,47 @@ class AdaptiveModalEditor(ModalClustersEditor):
         self.__mods = []
         self.prop_def = None
 
+        # Properties definitions of modifiers type, or
+        # properties common for all modifiers types.
+        self.__schema = None
+
+        # [(ModifierSchema, modifiers)] for every modifiers type.
+        self.__groups = []
+
+        # Shortcuts lookups of modifiers type.
+        self.__shortcuts = None
+
+        # Active mode property definitions.
+        self.__prop_def = None
+        self.__prop = None
+
+        # Incremented every time editor changes props values.
+        self.__values_version = 0
+
+        # Overlay lines for last values version and modifiers.
+        self.__mappings_key = None
+        self.__mappings = []
+
+        # {shortcut id: [shortcut, value, line]}
+        self.__mappings_lines = {}
+
+        # Pointers of edited objects, watched for outside changes.
+        self.__objects = set()
+
+        # Mouse input coalescing.
+        self.__coalesce = False
+        self.__coalescer = MouseDeltaCoalescer()
+        self.__coalescer_timer = None
+        self.__coalescer_timer_interval = None
+
+        # Start of depsgraph evaluation, measured from handlers.
+        self.__evaluation_start = None
+
+        # Degrade expensive modifiers while editing.
+        self.__proxy = False
+        self.__proxy_threshold = 0.0
+        self.__proxy_evaluation = ProxyEvaluation()
+
     # ClustersEditor methods
     def editor_switched_to(self, context, clusters):
         """Called every time editor is switched to."""
@@ -209,23 +258,33 @@ class AdaptiveModalEditor(ModalClustersEditor):
             if not isinstance(x, ClusterTrait):
                 raise TypeError
 
-        self.__switch_to_default()
+        self.__switch_to_default(context)
 
         self.__kbs_modal = set()
         self.__kbs_no_modal = set()
         self.__kbs_editing = set()
 
-        mods = self.__get_all_clusters_modifiers(clusters)
+        groups = self.__get_all_clusters_modifiers(clusters)
+        mods = []
+        for x in groups.values():
+            mods.extend(x)
         mod = mods[0]
         self.__mods = mods
+        self.__mappings_key = None
+        self.__start_watching_objects()
 
-        # Get existing shortcuts
+        # Get settings
         prefs = bpy.context.preferences.addons['emtk'].preferences
-        s = prefs.modal_shortcuts.find_by_value(mod.type)
-        self.modal_shortcuts = s
+        self.__coalesce = prefs.coalesce_mouse_input
+        self.__proxy = prefs.proxy_evaluation
+        self.__proxy_threshold = prefs.proxy_evaluation_threshold / 1000
 
         # Filter properties.
-        props = get_props_filtered_by_types(mods[0])
+        self.__groups = []
+        for x in groups.values():
+            self.__groups.append((get_modifier_schema(x[0]), x))
+        self.__schema = get_common_schema([x[0] for x in self.__groups])
+        props = self.__schema.props_by_type
         for x in props:
             for y in props[x]:
                 if x in self.__MODAL_INPUT_PROP_TYPES:
@@ -235,22 +294,12 @@ class AdaptiveModalEditor(ModalClustersEditor):
                 else:
                     raise TypeError
 
-        # Create new shortcuts group, if needed.
-        if s is None:
-            s = ModalShortcutsGroup(mod.type, [])
-
-        # Generate missing shortcuts.
-        new_props = []
-        for x in props:
-            for y in props[x]:
-                if not s.find_by_shortcut_id(y):
-                    new_props.append(y)
-        for x in new_props:
-            s.add(generate_new_shortcut(x, s.shortcuts))
-
-        # Update cache if shortcuts group changed.
-        if len(new_props) > 0:
-            prefs.modal_shortcuts.update(s)
+        # Get shortcuts, generate missing ones.
+        # Shortcuts of first modifiers type are used for all types.
+        s = get_or_generate_shortcuts(
+            mod.type, self.__groups[0][0].props)
+        self.modal_shortcuts = s.group
+        self.__shortcuts = s
 
         logger.debug('Editor switched to.')
         logger.debug('Modal props mappings')
@@ -268,13 +317,31 @@ class AdaptiveModalEditor(ModalClustersEditor):
             if not isinstance(x, ClusterTrait):
                 raise TypeError
 
-        self.__switch_to_default()
+        self.__switch_to_default(context)
+        self.__stop_watching_objects()
         self.__mods = []
+        self.__schema = None
+        self.__groups = []
+        self.__mappings_key = None
+        self.__mappings_lines = {}
         self.__kbs_modal = set()
         self.__kbs_no_modal = set()
         self.__kbs_editing = set()
         logger.debug('Editor switched from.')
 
+    def editor_stack_changed(self, context, clusters, change):
+        """Called every time modifiers stack changed,
+        but active cluster is the same.
+        """
+        # Edited properties only depend on modifiers of clusters.
+        mods = []
+        for x in self.__get_all_clusters_modifiers(clusters).values():
+            mods.extend(x)
+        if mods != self.__mods:
+            return False
+        logger.debug(f'Editor patched after {change}.')
+        return True
+
     def editor_modal_pre(
             self, context, event, *args, **kwargs):
         return
@@ -283,15 +350,15 @@ class AdaptiveModalEditor(ModalClustersEditor):
             self, context, event, *args, **kwargs):
         logger.debug(f'Event {event.type}, {event.value}')
         if self.mode == self.__DEFAULT_MODE:
-            self.__default_mode(event)
+            self.__default_mode(context, event)
         elif self.mode in self.__kbs_modal:
-            self.__modal_mode(event)
+            self.__modal_mode(context, event)
         elif self.mode in self.__kbs_editing:
             raise ValueError
         elif self.mode in self.__kbs_no_modal:
             raise ValueError
 
-    def __default_mode(self, event):
+    def __default_mode(self, context, event):
         """
         No props besides bools and enums can be edited in default mode.
         No modal input mode can be used in default mode.
@@ -312,15 +379,15 @@ class AdaptiveModalEditor(ModalClustersEditor):
 
         if prop_name is not None:
 
-            # Modifier prop def
-            prop_def = self.__mods[0].rna_type.properties[prop_name]
+            # Modifier prop schema
+            prop = self.__schema.props[prop_name]
 
             # Try to edit not modal props.
             if prop_name in self.__kbs_no_modal:
-                if prop_def.type == 'BOOLEAN':
+                if prop.type == 'BOOLEAN':
                     if self.__toggle_bool(prop_name):
                         return True
-                elif prop_def.type == 'ENUM':
+                elif prop.type == 'ENUM':
                     if self.__scroll_enum(prop_name):
                         return True
                 else:
@@ -329,12 +396,13 @@ class AdaptiveModalEditor(ModalClustersEditor):
             # Try to switch to modal prop mode.
             elif prop_name in self.__kbs_modal:
                 logger.info(f'Switching to modal {prop_name}')
-                self.__switch_to_mode(prop_name)
+                self.__switch_to_mode(context, prop_name)
 
                 # Switch to modal input mode
-                t = prop_def.type
+                t = prop.type
                 if t in self.__DELTA_INPUT_TYPES:
                     self.modal_input_mode = 'DELTA'
+                    self.__start_delta_input(context)
                 elif t in self.__DIGITS_INPUT_TYPES:
                     self.modal_input_mode = 'DIGITS'
                 elif t in self.__LETTERS_INPUT_TYPES:
@@ -349,7 +417,7 @@ class AdaptiveModalEditor(ModalClustersEditor):
         else:
             pass
 
-    def __modal_mode(self, event):
+    def __modal_mode(self, context, event):
         """
         Mode used to edit properties within multiple iterations.
 
@@ -367,17 +435,18 @@ class AdaptiveModalEditor(ModalClustersEditor):
 
         if self.modal_input_mode == 'DELTA':
             if self.__check_event_is_simple(event):
-                if self.__check_if_should_switch_mode(event):
+                if self.__check_if_should_switch_mode(context, event):
                     return True
-                elif self.__check_if_should_switch_input_mode(event):
+                elif self.__check_if_should_switch_input_mode(
+                        context, event):
                     return True
             else:
-                if self.__check_if_delta_prop_changed(event):
+                if self.__check_if_delta_prop_changed(context, event):
                     return True
 
         elif self.modal_input_mode == 'DIGITS':
             if self.__check_event_is_simple(event):
-                if self.__check_if_stop_modal_digits(event):
+                if self.__check_if_stop_modal_digits(context, event):
                     return True
                 elif self.__check_if_modal_digits(event):
                     return True
@@ -386,7 +455,7 @@ class AdaptiveModalEditor(ModalClustersEditor):
 
         elif self.modal_input_mode == 'LETTERS':
             if self.__check_event_is_simple(event):
-                if self.__check_if_stop_modal_letters(event):
+                if self.__check_if_stop_modal_letters(context, event):
                     return True
                 elif self.__check_if_modal_letters(event):
                     return True
@@ -397,140 +466,211 @@ class AdaptiveModalEditor(ModalClustersEditor):
 
     # Simple events
 
-    def __check_if_should_switch_mode(self, event):
+    def __check_if_should_switch_mode(self, context, event):
         prop_name = self.__get_shortcut_value(event)
         if prop_name == self.mode:
             logger.info('Switching back to default mode.')
-            self.__switch_to_default()
+            self.__switch_to_default(context)
             return True
 
-    def __check_if_should_switch_input_mode(self, event):
+    def __check_if_should_switch_input_mode(self, context, event):
 
-        # TODO: move to attrs
-        # Get prop name and def for mode
+        # Get prop name and type for mode
         prop_name = self.mode
-        prop_def = self.__mods[0].rna_type.properties[self.mode]
+        t = self.__prop.type
 
         if event.type in self._ModalInputOperator__MODAL_DIGITS_LIST\
-                and prop_def.type in self.__DIGITS_INPUT_TYPES:
+                and t in self.__DIGITS_INPUT_TYPES:
             logger.info(f'Switching to modal digits {prop_name}')
+            self.__stop_delta_input(context)
             self.modal_input_mode = 'DIGITS'
-            self.modal_digits(event, prop_def)
+            self.modal_digits(event, self.__prop_def)
             return True
 
         elif event.type\
                 in string.ascii_uppercase\
-                and prop_def.type in self.__LETTERS_INPUT_TYPES:
+                and t in self.__LETTERS_INPUT_TYPES:
             logger.info(f'Switching to modal letters {prop_name}')
+            self.__stop_delta_input(context)
             self.modal_input_mode = 'LETTERS'
-            self.modal_letters(event, prop_def)
+            self.modal_letters(event, self.__prop_def)
             return True
 
     # Digits and letters
     def __check_if_modal_letters(self, event):
-        # Get prop name and def for mode
+        # Get prop name for mode
         prop_name = self.mode
-        prop_def = self.__mods[0].rna_type.properties[self.mode]
 
         logger.debug(f'Modal letters {prop_name}')
-        if self.modal_letters(event, prop_def):
+        if self.modal_letters(event, self.__prop_def):
             return True
 
-    def __check_if_stop_modal_letters(self, event):
+    def __check_if_stop_modal_letters(self, context, event):
         # Get prop name and def for mode
         prop_name = self.mode
 
         if event.type == 'RET':
             logger.info(f'Modal digits apply {prop_name}')
             val = self.modal_digits_pop()
-            for mod in self.__mods:
-                setattr(mod, self.mode, val)
-            self.__switch_to_default()
+            self.__set_values(self.mode, val)
+            self.__switch_to_default(context)
             return True
 
     def __check_if_modal_digits(self, event):
-        # Get prop name and def for mode
+        # Get prop name for mode
         prop_name = self.mode
-        prop_def = self.__mods[0].rna_type.properties[self.mode]
 
         logger.debug(f'Modal digits {prop_name}')
-        if self.modal_digits(event, prop_def):
+        if self.modal_digits(event, self.__prop_def):
             return True
 
-    def __check_if_stop_modal_digits(self, event):
+    def __check_if_stop_modal_digits(self, context, event):
         # Get prop name and def for mode
         prop_name = self.mode
 
         if event.type == 'RET':
             logger.info(f'Modal letters apply {prop_name}')
             val = self.modal_letters_pop()
-            for mod in self.__mods:
-                setattr(mod, self.mode, val)
-            self.__switch_to_default()
+            self.__set_values(self.mode, val)
+            self.__switch_to_default(context)
             return True
 
     # Complex events
 
-    def __check_if_delta_prop_changed(self, event) -> None:
+    def __check_if_delta_prop_changed(self, context, event) -> None:
 
-        # Use active mode prop name.
-        prop_name = self.mode
-        prop_def = self.__mods[0].rna_type.properties[prop_name]
+        logger.debug(f'Modal check if delta changed {self.mode}')
 
-        logger.debug(f'Modal check if delta changed {prop_name}')
+        # Write coalesced mouse input once per tick.
+        if event.type == 'TIMER':
+            if self.__coalescer.pending and self.__coalescer.ready():
+                self.__flush_coalesced_delta(context)
+            return
 
         if event.type not in {'MOUSEMOVE'}:
             return
 
+        if self.__coalesce:
+            self.__coalescer.add(event)
+            if self.__coalescer.ready():
+                self.__flush_coalesced_delta(context)
+        else:
+            self.__edit_delta_prop(event)
+
+    def __edit_delta_prop(self, event) -> None:
+
+        # Use active mode prop name.
+        prop_name = self.mode
+        t = self.__prop.type
+
         # Try to edit props.
-        if prop_def.type == 'INT':
+        if t == 'INT':
             self.__modal_int(event, prop_name)
-        elif prop_def.type == 'FLOAT':
+        elif t == 'FLOAT':
             self.__modal_float(event, prop_name)
-        elif prop_def.type == 'STRING':
+        elif t == 'STRING':
             self.__modal_str(event, prop_name)
         return
 
+    # Mouse input
+
+    def __start_delta_input(self, context) -> None:
+        self.__start_coalescing(context)
+        if self.__proxy:
+            self.__proxy_evaluation.start(
+                self.__mods, self.__proxy_threshold)
+
+    def __stop_delta_input(self, context) -> None:
+        """Finishes editing and restores degraded modifiers."""
+        self.__stop_coalescing(context)
+        self.__proxy_evaluation.stop()
+
+    def __start_coalescing(self, context) -> None:
+        if not self.__coalesce:
+            return
+        self.__coalescer.clear()
+        self.__update_coalescer_timer(context)
+
+    def __stop_coalescing(self, context) -> None:
+        """Writes all remaining mouse input and removes timer."""
+        if self.__coalescer.pending:
+            self.__flush_coalesced_delta(context)
+        if self.__coalescer_timer is not None:
+            context.window_manager.event_timer_remove(
+                self.__coalescer_timer)
+            self.__coalescer_timer = None
+            self.__coalescer_timer_interval = None
+
+    def __flush_coalesced_delta(self, context) -> None:
+        """Writes coalesced mouse input.
+
+        Objects are evaluated on redraw, evaluation time is
+        measured from depsgraph handlers.
+        """
+        event = self.__coalescer.pop()
+        if event is None:
+            return
+        self.__edit_delta_prop(event)
+        self.__update_coalescer_timer(context)
+
+    def __update_coalescer_timer(self, context) -> None:
+        """Replaces timer, if tick interval changed noticeably."""
+        interval = self.__coalescer.interval
+        x = self.__coalescer_timer_interval
+        if x is not None and abs(x - interval) < x / 4:
+            return
+        wm = context.window_manager
+        if self.__coalescer_timer is not None:
+            wm.event_timer_remove(self.__coalescer_timer)
+        self.__coalescer_timer = wm.event_timer_add(
+            interval, window=context.window)
+        self.__coalescer_timer_interval = interval
+
     # Properties editing
 
     def __toggle_bool(self, prop_name):
         logger.info(f'Toggle {prop_name}')
 
         t = True
-        for x in self.__mods:
-            attr = getattr(x, prop_name)
-            if attr is True:
-                t = False
-        for x in self.__mods:
-            setattr(x, prop_name, t)
+        if True in self.__get_values(prop_name):
+            t = False
+        self.__set_values(prop_name, t)
 
     def __scroll_enum(self, prop_name):
         logger.info(f'Scroll {prop_name}')
 
-        prop_def = self.__mods[0].rna_type.properties[prop_name]
-        for x in self.__mods:
-            attr = getattr(x, prop_name)
-            enum = prop_def.enum_items.keys()
-            i = enum.index(attr)
-            if i == len(enum) - 1:
-                setattr(x, prop_name, enum[0])
-            else:
-                setattr(x, prop_name, enum[i + 1])
+        # Enum items can be different for every modifiers type.
+        # Enums can't be written with foreach_set, so values of
+        # every modifier are set one by one.
+        for schema, mods in self.__groups:
+            prop = schema.props[prop_name]
+            if prop.is_enum_flag:
+                continue
+            values = []
+            for x in get_props_values(mods, prop):
+                y = get_enum_successor(prop, x)
+                if y is None:
+                    y = x
+                values.append(y)
+            set_props_values(mods, prop, values)
+        self.__values_changed()
 
     def __modal_int(self, event, prop_name):
         logger.debug(f'Modal int {prop_name}')
+        values = []
         for x in self.__mods:
-            new_val = self.modal_input_mouse_rna_type(
-                x, prop_name, event)
-            setattr(x, prop_name, new_val)
+            values.append(self.modal_input_mouse_rna_type(
+                x, prop_name, event))
+        self.__set_values(prop_name, values)
         return
 
     def __modal_float(self, event, prop_name):
         logger.debug(f'Modal float {prop_name}')
+        values = []
         for x in self.__mods:
-            new_val = self.modal_input_mouse_rna_type(
-                x, prop_name, event)
-            setattr(x, prop_name, new_val)
+            values.append(self.modal_input_mouse_rna_type(
+                x, prop_name, event))
+        self.__set_values(prop_name, values)
         return
 
     def __modal_str(self, event, prop_name):
@@ -544,8 +684,8 @@ class AdaptiveModalEditor(ModalClustersEditor):
         logger.debug(f'Look up kbs for {event.type}')
         if len(event.type) != 1:
             return None
-        s = self.modal_shortcuts.find_by_event(event)
-        if s:
+        s = self.__shortcuts.find_by_event(event)
+        if s and s.shortcut_id in self.__schema.props:
             return s.shortcut_id
         return None
 
@@ -558,35 +698,125 @@ class AdaptiveModalEditor(ModalClustersEditor):
         return False
 
     def __get_all_clusters_modifiers(self, clusters):
-        """Returns list of modifiers to edit."""
+        """Returns {modifier type: modifiers} dict with
+        modifiers to edit.
+        """
         if not isinstance(clusters, list):
             clusters = [clusters]
-        mods = []
+        result = {}
         for x in clusters:
-            mods.extend(x.all_modifiers())
-
-        # Check that modifiers are of same type.
-        t = None
-        for x in mods:
-            if t is None:
-                t = x.type
-            elif x.type != t:
-                raise TypeError
-        return mods
+            for mod in x.all_modifiers():
+                result.setdefault(mod.type, []).append(mod)
+        return result
+
+    def __get_values(self, prop_name: str) -> list:
+        """Returns prop values of all modifiers in __mods order."""
+        result = []
+        for schema, mods in self.__groups:
+            result.extend(get_props_values(mods, schema.props[prop_name]))
+        return result
+
+    def __set_values(self, prop_name: str, values) -> None:
+        """Writes values with one batch for every modifiers type.
 
-    def __switch_to_mode(self, mode_name: str) -> None:
+        values can be a list in __mods order or a single value.
+        """
+        if not isinstance(values, list):
+            values = [values] * len(self.__mods)
+        i = 0
+        for schema, mods in self.__groups:
+            set_props_values(
+                mods, schema.props[prop_name], values[i:i + len(mods)])
+            i += len(mods)
+        self.__values_changed()
+
+    def __switch_to_mode(self, context, mode_name: str) -> None:
         if mode_name == self.__DEFAULT_MODE:
-            return self.__switch_to_default()
+            return self.__switch_to_default(context)
         self.mode = mode_name
+
+        # Resolve property once per mode switch.
         self.__prop_def = self.__mods[0].rna_type.properties[mode_name]
+        self.__prop = self.__schema.props[mode_name]
 
-    def __switch_to_default(self) -> None:
+    def __switch_to_default(self, context) -> None:
+        self.__stop_delta_input(context)
         self.mode = self.__DEFAULT_MODE
         self.modal_input_mode = self._ModalInputOperator__DEFAULT_MODE
         self.__prop_def = None
+        self.__prop = None
+
+    def __values_changed(self) -> None:
+        self.__values_version += 1
+
+    def editor_values_changed(self) -> None:
+        """Called when modifiers props were changed outside of editor."""
+        self.__values_changed()
+
+    def __start_watching_objects(self) -> None:
+        """Changes values version every time edited objects are
+        updated outside of editor, for example from properties panel.
+        """
+        self.__objects = {x.id_data.as_pointer() for x in self.__mods}
+        self.__evaluation_start = None
+        handlers = bpy.app.handlers
+        if self.__depsgraph_update_pre not in handlers.depsgraph_update_pre:
+            handlers.depsgraph_update_pre.append(self.__depsgraph_update_pre)
+        if self.__depsgraph_update not in handlers.depsgraph_update_post:
+            handlers.depsgraph_update_post.append(self.__depsgraph_update)
+
+    def __stop_watching_objects(self) -> None:
+        self.__objects = set()
+        self.__evaluation_start = None
+        handlers = bpy.app.handlers
+        if self.__depsgraph_update_pre in handlers.depsgraph_update_pre:
+            handlers.depsgraph_update_pre.remove(self.__depsgraph_update_pre)
+        if self.__depsgraph_update in handlers.depsgraph_update_post:
+            handlers.depsgraph_update_post.remove(self.__depsgraph_update)
+
+    def __depsgraph_update_pre(self, *args):
+        self.__evaluation_start = time.perf_counter()
+
+    def __depsgraph_update(self, scene, depsgraph):
+        start = self.__evaluation_start
+        self.__evaluation_start = None
+        for x in depsgraph.updates:
+            if x.id.original.as_pointer() in self.__objects:
+                if start is not None:
+                    self.__coalescer.measure(time.perf_counter() - start)
+                self.__values_changed()
+                return
 
     # UI
 
+    def get_values_version(self) -> int:
+        """Returns number of properties changes."""
+        return self.__values_version
+
+    def get_ui_state(self):
+        """Returns hashable editor state."""
+        return (self.mode,
+                self.modal_input_mode,
+                self.modal_digits_get(),
+                self.modal_letters_get(),
+                self.__values_version)
+
+    def get_status_for_ui(self) -> str:
+        """Returns editor mode, value and last evaluation time.
+
+        Example:
+        'angle_limit 0.52 | 3.1 ms'
+        """
+        line = self.mode
+        if self.__prop is not None:
+            value = getattr(self.__mods[0], self.__prop.name)
+            value = self.__get_props_val_format(value, self.__prop.name)
+            line = f"{line} {value}"
+        t = self.__coalescer.evaluation_time
+        if t:
+            line = f"{line} | {format_cost(t)}"
+        return line
+
     def get_mappings_for_ui(self):
         """Returns list of strings with info about props.
 
@@ -594,10 +824,32 @@ class AdaptiveModalEditor(ModalClustersEditor):
         ['Angle Limit: shift + A | 0.00123']
         """
 
+        # Nothing changed since last call.
+        key = (self.__values_version,
+               tuple(x.as_pointer() for x in self.__mods))
+        if key == self.__mappings_key:
+            return self.__mappings
+
         result = []
+        mod = self.__mods[0]
         for x in self.modal_shortcuts.shortcuts:
-            result.append(str(x) + ' ' + self.__get_props_val_format(
-                getattr(self.__mods[0], x.shortcut_id), x.shortcut_id))
+            if x.shortcut_id not in self.__schema.props:
+                continue
+            value = getattr(mod, x.shortcut_id)
+
+            # Format only changed values.
+            cached = self.__mappings_lines.get(x.shortcut_id)
+            if cached is not None and cached[0] is x\
+                    and cached[1] == value:
+                result.append(cached[2])
+                continue
+            line = str(x) + ' ' + self.__get_props_val_format(
+                value, x.shortcut_id)
+            self.__mappings_lines.update({x.shortcut_id: [x, value, line]})
+            result.append(line)
+
+        self.__mappings_key = key
+        self.__mappings = result
         return result
 
     def __get_props_val_format(self,
@@ -607,9 +859,9 @@ class AdaptiveModalEditor(ModalClustersEditor):
         """
         [['123.456']...]
         """
-        prop_def = self.__mods[0].rna_type.properties[attr_name]
-        if prop_def.type == 'FLOAT':
-            if prop_def.subtype in {'ANGLE', 'DEGREES'}:
+        prop = self.__schema.props.get(attr_name)
+        if prop is not None and prop.type == 'FLOAT':
+            if prop.subtype in {'ANGLE', 'DEGREES'}:
                 value = value * math.degrees(1)
             value = round(value, round_val)
         line = str(value)
@@ -0,0 +1,98 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import logging
+import time
+
+import bpy
+from bpy.props import IntProperty
+
+from ...utils.batch_write import set_props_values
+from ...utils.modifier_schema import get_modifier_schema
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Stacks to compare write paths with.
+# (description, number of objects, modifiers types per object,
+#  edited modifiers type, edited prop)
+# foreach_set is only used for objects which modifiers all have
+# edited type, other cases show cost of setattr fallback.
+_CASES = [
+    ('1000 Smooth on one object', 1, ['SMOOTH'] * 1000, 'SMOOTH', 'factor'),
+    ('100 Smooth on one object', 1, ['SMOOTH'] * 100, 'SMOOTH', 'factor'),
+    ('10 Bevel in 40 mixed modifiers', 1,
+     ['BEVEL', 'SMOOTH', 'SUBSURF', 'WEIGHTED_NORMAL'] * 10,
+     'BEVEL', 'width'),
+    ('100 objects with one Bevel', 100, ['BEVEL'], 'BEVEL', 'width'),
+    ('100 objects with Bevel and Weighted Normal', 100,
+     ['BEVEL', 'WEIGHTED_NORMAL'], 'BEVEL', 'width'),
+]
+
+
+class EMTK_OT_benchmark_batch_write(bpy.types.Operator):
+    bl_idname = "emtk.benchmark_batch_write"
+    bl_label = "EMTK benchmark batch write"
+    bl_description = "Compare per-modifier and batched property writes"
+
+    iterations: IntProperty(name="Number of writes", default=50)
+
+    def execute(self, context):
+        lines = []
+        for x in _CASES:
+            before, after = self.__measure(*x[1:])
+            line = f'{x[0]}, '\
+                f'setattr: {before * 1000:.3f} ms/write, '\
+                f'set_props_values: {after * 1000:.3f} ms/write'
+            logger.info(line)
+            lines.append(line)
+        self.report({'INFO'}, ' | '.join(lines))
+        return {'FINISHED'}
+
+    def __measure(self, objects_number, types, edited_type, prop_name):
+        objects = []
+        try:
+            mods = []
+            for x in range(objects_number):
+                mesh = bpy.data.meshes.new('emtk_benchmark')
+                obj = bpy.data.objects.new('emtk_benchmark', mesh)
+                objects.append(obj)
+                for i, t in enumerate(types):
+                    mod = obj.modifiers.new(f'{t} {i}', t)
+                    mod.show_viewport = False
+                    if t == edited_type:
+                        mods.append(mod)
+            prop = get_modifier_schema(mods[0]).props[prop_name]
+
+            t = time.perf_counter()
+            for i in range(self.iterations):
+                for mod in mods:
+                    setattr(mod, prop_name, i / self.iterations)
+            before = (time.perf_counter() - t) / self.iterations
+
+            t = time.perf_counter()
+            for i in range(self.iterations):
+                set_props_values(mods, prop, i / self.iterations)
+            after = (time.perf_counter() - t) / self.iterations
+        finally:
+            for obj in objects:
+                mesh = obj.data
+                bpy.data.objects.remove(obj)
+                bpy.data.meshes.remove(mesh)
+        return before, after
@@ -0,0 +1,176 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import collections
+import logging
+import time
+
+import bpy
+from bpy.props import IntProperty
+from libemtk.lists.extended_modifiers_list import ExtendedModifiersList
+
+from ...classes.event_dispatch import EventDispatchTable
+from ...classes.modal_clusters_operator import ModalClustersOperator
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+BenchmarkEvent = collections.namedtuple(
+    'BenchmarkEvent', ['type', 'value', 'shift', 'ctrl'])
+
+# Events that modal operator receives most of the time.
+_EVENTS = [
+    BenchmarkEvent('MOUSEMOVE', 'NOTHING', False, False),
+    BenchmarkEvent('TIMER', 'NOTHING', False, False),
+    BenchmarkEvent('INBETWEEN_MOUSEMOVE', 'NOTHING', False, False),
+    BenchmarkEvent('E', 'RELEASE', False, False),
+    BenchmarkEvent('F', 'PRESS', False, False),
+    BenchmarkEvent('X', 'PRESS', True, False),
+]
+
+
+def _baseline_modal(event, m_list, kbs):
+    """
+    Interprets event with the same checks, in the same order,
+    as ModalClustersOperator modal and __modal_actions did before
+    dispatch table. Returns name of matched action.
+    """
+    # modal
+    if (event.type == kbs['exit'] or event.type == 'LEFTMOUSE')\
+            and event.value == 'PRESS':
+        return 'exit'
+    elif event.type in {'RIGHTMOUSE', 'ESC'}:
+        return 'cancel'
+    elif event.type == 'SPACE' and event.value == 'PRESS':
+        return 'switch_mode'
+
+    # __modal_actions
+    m_list.get_layer()
+    m_list.get_cluster()
+    if (event.type == kbs['visibility_1'])\
+            & (event.value == 'PRESS'):
+        return 'visibility_1'
+    elif (event.type == kbs['visibility_2'])\
+            & (event.value == 'PRESS'):
+        return 'visibility_2'
+    elif (event.type == kbs['sort'])\
+            & (event.value == 'PRESS'):
+        return 'sort'
+    elif (event.type == kbs['add_new'])\
+            & (event.value == 'PRESS'):
+        return 'add_new'
+    elif (event.type == kbs['apply_remove'])\
+            & event.shift & (event.value == 'PRESS'):
+        return 'apply'
+    elif (event.type == kbs['construct_deconstruct'])\
+            & event.shift & (event.value == 'PRESS'):
+        return 'deconstruct'
+    elif (event.type == kbs['construct_deconstruct'])\
+            & (event.value == 'PRESS'):
+        return 'construct'
+    elif (event.type == kbs['toogle_selection'])\
+            & (event.value == 'PRESS'):
+        return 'toggle_selection'
+    elif (event.type == kbs['apply_remove'])\
+            & (event.value == 'PRESS'):
+        return 'remove'
+    elif (event.type == kbs['up'])\
+            & event.shift & (event.value == 'PRESS'):
+        return 'move_up'
+    elif (event.type == kbs['down'])\
+            & event.shift & (event.value == 'PRESS'):
+        return 'move_down'
+    elif (event.type == kbs['collapse'])\
+            & (event.value == 'PRESS'):
+        return 'collapse'
+    elif (event.type == kbs['up'])\
+            & (event.value == 'PRESS'):
+        return 'previous'
+    elif (event.type == kbs['down'])\
+            & (event.value == 'PRESS'):
+        return 'next'
+    return None
+
+
+def _current_modal(event, table, exit_events, selecting):
+    """
+    Interprets event the same way ModalClustersOperator modal
+    does with dispatch table. Returns matched handler.
+    """
+    if (event.type, event.value) in exit_events:
+        return 'exit'
+    elif event.type in {'RIGHTMOUSE', 'ESC'}:
+        return 'cancel'
+    elif event.type == 'SPACE' and event.value == 'PRESS':
+        return 'switch_mode'
+    return table.get(event, selecting)
+
+
+class EMTK_OT_benchmark_modal_dispatch(bpy.types.Operator):
+    bl_idname = "emtk.benchmark_modal_dispatch"
+    bl_label = "EMTK benchmark modal dispatch"
+    bl_description = "Measure per-event latency of EMTKM actions dispatch"
+
+    clusters_number: IntProperty(name="Number of clusters", default=200)
+    events_number: IntProperty(name="Number of events", default=10000)
+
+    def execute(self, context):
+        mesh = bpy.data.meshes.new('emtk_benchmark')
+        obj = bpy.data.objects.new('emtk_benchmark', mesh)
+        context.collection.objects.link(obj)
+        try:
+            for x in range(self.clusters_number):
+                mod = obj.modifiers.new(f'Smooth {x}', 'SMOOTH')
+                mod.show_viewport = False
+            m_list = ExtendedModifiersList(obj, cluster_types=[])
+
+            # Old chain looked up active layer on every event,
+            # which scans the stack up to active cluster.
+            m_list.active = m_list[-1]
+
+            definitions = ModalClustersOperator._EMTK_ACTIONS
+            kbs = ModalClustersOperator._ModalClustersOperator__emtk_kbs
+            handlers = {}
+            for x in definitions:
+                handlers.update({x[0]: x[0]})
+            table = EventDispatchTable()
+            table.build(definitions, kbs, handlers)
+
+            events = _EVENTS * (self.events_number // len(_EVENTS))
+
+            t = time.perf_counter()
+            for x in events:
+                _baseline_modal(x, m_list, kbs)
+            before = (time.perf_counter() - t) / len(events)
+
+            exit_events = {(kbs['exit'], 'PRESS'), ('LEFTMOUSE', 'PRESS')}
+            t = time.perf_counter()
+            for x in events:
+                _current_modal(x, table, exit_events, False)
+            after = (time.perf_counter() - t) / len(events)
+        finally:
+            bpy.data.objects.remove(obj)
+            bpy.data.meshes.remove(mesh)
+
+        line = f'{self.clusters_number} clusters, '\
+            f'if/elif chain: {before * 1000000:.3f} us/event, '\
+            f'dispatch table: {after * 1000000:.3f} us/event'
+        logger.info(line)
+        self.report({'INFO'}, line)
+        return {'FINISHED'}
@@ -21,7 +21,9 @@ import logging
 
 from bpy.types import Operator
 
+from ..classes.editors_registry import EditorsRegistry
 from ..classes.modal_clusters_operator import ModalClustersOperator
+from ..classes.stack_change import StackChange
 from ..editors.adaptive import AdaptiveModalEditor
 from ..ui.emtk_ui import EMTKUi
 
@@ -36,17 +38,27 @@ class EMTK_OT_emtkm(EMTKUi, ModalClustersOperator, Operator):
     bl_label = "EMTKM"
     bl_description = "Edit modifiers on selected objects"
 
+    # Editors that are created on first use.
+    # (factory, name, cluster types)
+    _EMTKM_EDITORS = [
+        (AdaptiveModalEditor, 'Adaptive_Editor', ['ANY']),
+    ]
+
     def __init__(self):
-        """Creates list of all editors."""
+        """Creates registry of all editors."""
 
-        # List of all editors
-        self.__editors = []
+        # All editors by cluster type
+        self.__editors = EditorsRegistry()
+        for x in self._EMTKM_EDITORS:
+            self.__editors.add(*x)
         # List of possible editors for currently selected modifier
         self.__possible_editors = []
         # Active editor
         self.__active_editor = None
-
-        self.__editors.append(AdaptiveModalEditor())
+        # Clusters edited by active editor
+        self.__edited_clusters = []
+        # Active object cluster edited by active editor
+        self.__edited_cluster = None
 
     # EMTKMod methods
     # TODO: rename this methods
@@ -55,7 +67,7 @@ class EMTK_OT_emtkm(EMTKUi, ModalClustersOperator, Operator):
         editor = self.get_editor()
         if editor is not None:
             return editor.editor_modal_pre(
-                context, event, self.m_list.get_cluster())
+                context, event, self.__edited_clusters)
         else:
             raise TypeError
 
@@ -72,8 +84,14 @@ class EMTK_OT_emtkm(EMTKUi, ModalClustersOperator, Operator):
         # Editor modal.
         editor = self.get_editor()
         if editor is not None:
-            return editor.editor_modal(
-                context, event, self.m_list.get_cluster())
+            version = editor.get_values_version()
+            result = editor.editor_modal(
+                context, event, self.__edited_clusters)
+
+            # Save edited clusters on operator finish.
+            if editor.get_values_version() != version:
+                self.mark_clusters_dirty(self.__edited_cluster)
+            return result
         else:
             raise TypeError
 
@@ -88,7 +106,16 @@ class EMTK_OT_emtkm(EMTKUi, ModalClustersOperator, Operator):
         # Call remove method of editor
         if self.__active_editor is not None:
             self.__active_editor.editor_switched_from(
-                context, self.m_list.get_cluster())
+                context, self.__edited_clusters)
+
+            # Editor can write remaining values while switching.
+            if self.__edited_cluster is not None:
+                self.mark_clusters_dirty(self.__edited_cluster)
+
+        # Active cluster and matching clusters of selected objects.
+        self.__edited_cluster = self.m_list.get_cluster()
+        self.__edited_clusters = self.get_broadcast_clusters(
+            self.__edited_cluster)
 
         # Get list of possible ediors
         self.__possible_editors = self.__get_editors(self.m_list.get_cluster())
@@ -102,27 +129,98 @@ class EMTK_OT_emtkm(EMTKUi, ModalClustersOperator, Operator):
         # Call invoke method of editor
         if self.__active_editor is not None:
             self.__active_editor.editor_switched_to(
-                context, self.m_list.get_cluster())
+                context, self.__edited_clusters)
+
+    def emtk_stack_changed(self, context, change):
+        """
+        This method is called by emtkmod every time
+        action changed modifiers stack.
+        """
+
+        logger.debug(f'EMTKM stack changed: {change}')
+
+        # Remove changed clusters from UI cache.
+        self.emtk_ui_clusters_changed(change)
+
+        # Active cluster is the same, try to keep editor state.
+        if not change.active_changed and self.__active_editor is not None:
+            clusters = self.get_broadcast_clusters(self.m_list.get_cluster())
+            if self.__active_editor.editor_stack_changed(
+                    context, clusters, change):
+                self.__edited_clusters = clusters
+                return
+
+        # Removed modifiers can not be marked. Stack fingerprint
+        # changed, so all modifiers are saved anyway.
+        if change.kind == StackChange.REMOVED:
+            self.__edited_cluster = None
+
+        # Rebuild editor state.
+        self.emtk_modifier_update(context)
+
+    def mark_clusters_dirty(self, clusters) -> None:
+        """
+        Method that is used by ModalClustersOperator
+        Also lets editor know that values changed
+        """
+        super().mark_clusters_dirty(clusters)
+        if self.__active_editor is not None:
+            self.__active_editor.editor_values_changed()
 
     def emtk_operator_inv(self, context, event):
         """
         Method that is used by EMTKMod
         Additional invoke method
         """
-        for editor in self.__editors:
+        for editor in self.__editors.instances():
             self.__initialize_emtkm_editor(editor)
 
-    def emtk_operator_rm(self, context):
+        addon_prefs = context.preferences.addons['emtk'].preferences
+        self.emtk_ui_set_objects_mode(addon_prefs.overlay_objects)
+
+    def emtk_operator_remove(self, context):
         """
         Method that is used by EMTKMod
         Additional remove method
         """
-        del(self.__editors)
-        del(self.__possible_editors)
-        del(self.__active_editor)
+        try:
+            # Let editor remove its timers and finish editing.
+            # Editor can write remaining values while finishing.
+            if self.__active_editor is not None:
+                self.__active_editor.editor_switched_from(
+                    context, self.__edited_clusters)
+                if self.__edited_cluster is not None:
+                    self.mark_clusters_dirty(self.__edited_cluster)
+            del(self.__editors)
+            del(self.__possible_editors)
+            del(self.__active_editor)
+        except AttributeError:
+            logger.info('Editors were already removed.')
 
     # UI
 
+    def emtk_ui_state(self, context):
+        """
+        Method that is used by ModalClustersOperator
+        Returns hashable UI state
+        """
+        state = super().emtk_ui_state(context)
+        if self.__active_editor is not None:
+            return (state, self.__active_editor.get_ui_state())
+        return state
+
+    def emtk_status_line(self, context):
+        """
+        Method that is used by ModalClustersOperator
+        Returns statusbar line
+        """
+        line = super().emtk_status_line(context)
+        if self.__active_editor is not None:
+            status = self.__active_editor.get_status_for_ui()
+            if status:
+                line = f"{line} | {status}"
+        return line
+
     def emtk_ui(self, context):
         """
         Method that is used by EMTKUI
@@ -139,6 +237,10 @@ class EMTK_OT_emtkm(EMTKUi, ModalClustersOperator, Operator):
                 ui_t.append(f"Digits: {e.modal_digits_get()}")
                 ui_t.append(f"Letters: {e.modal_letters_get()}")
 
+            if self.broadcast:
+                n = len(self.__edited_clusters)
+                ui_t.append(f"Broadcasting to {n} clusters")
+
             ui_t.append("Possible editors:")
             for x in self.__possible_editors:
                 ui_t.append(x.props['name'])
@@ -146,7 +248,11 @@ class EMTK_OT_emtkm(EMTKUi, ModalClustersOperator, Operator):
             ui_t.append("No active editor")
 
         ui_t.append(" ")
-        ui_t_2 = self.emtk_ui_list()
+        max_lines = None
+        addon_prefs = context.preferences.addons['emtk'].preferences
+        if addon_prefs.overlay_windowed_list:
+            max_lines = self.emtk_ui_max_lines(context) - len(ui_t)
+        ui_t_2 = self.emtk_ui_list(max_lines)
         for x in ui_t_2:
             ui_t.append(x)
         if self.__active_editor is not None:
@@ -188,30 +294,26 @@ class EMTK_OT_emtkm(EMTKUi, ModalClustersOperator, Operator):
         """Adds new editor type or replaces existing one."""
         self.remove_editor(editor)
         self.__initialize_emtkm_editor(editor)
-        self.__editors.append(editor)
+        self.__editors.add_instance(editor)
+
+    def add_editor_type(self, factory, name, types):
+        """Adds editor that is created on first use."""
+        self.__editors.add(factory, name, types)
 
     def remove_editor(self, editor):
         """Removes editor from this operator."""
-        remove = []
-        for x in self.__editors:
-            if editor.props['name'] == x.props['name']\
-                    and editor.props['types']\
-                    == x.props['types']:
-                remove.append(x)
-        for x in remove:
-            if x is self.__active_editor:
-                raise ValueError
-            self.__editors.remove(x)
+        if self.__active_editor is not None\
+                and editor.props['name']\
+                == self.__active_editor.props['name']\
+                and editor.props['types']\
+                == self.__active_editor.props['types']:
+            raise ValueError
+        self.__editors.remove(editor.props['name'], editor.props['types'])
 
     def __get_editors(self, cluster):
         """Returns list of possible editors for cluster."""
-        editors_list = []
-        for editor in self.__editors:
-            if cluster.type in editor.props['types']:
-                editors_list.append(editor)
-            elif 'ANY' in editor.props['types']:
-                editors_list.append(editor)
-        return editors_list
+        return self.__editors.get(
+            cluster.type, self.__initialize_emtkm_editor)
 
     def __initialize_emtkm_editor(self, editor):
         editor.first_x = self.first_x
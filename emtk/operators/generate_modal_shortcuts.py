@@ -0,0 +1,61 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import logging
+
+import bpy
+from bpy.types import Operator
+from libemtk.utils.modifier_prop_types import MODIFIER_TYPES
+
+from ..utils.modifier_schema import get_modifier_schema
+from ..utils.shortcuts_index import flush_shortcuts, get_or_generate_shortcuts
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class EMTK_OT_generate_modal_shortcuts(Operator):
+    bl_idname = "emtk.generate_modal_shortcuts"
+    bl_label = "Generate modal shortcuts"
+    bl_description = "Generate missing modal shortcuts for all modifier types"
+
+    def execute(self, context):
+        mesh = bpy.data.meshes.new('emtk_shortcuts')
+        obj = bpy.data.objects.new('emtk_shortcuts', mesh)
+        types = 0
+        try:
+            for x in MODIFIER_TYPES:
+                try:
+                    mod = obj.modifiers.new(x.lower(), x)
+                except (RuntimeError, TypeError):
+                    mod = None
+                if mod is None:
+                    logger.info(f'Cant create modifier {x}')
+                    continue
+                schema = get_modifier_schema(mod)
+                get_or_generate_shortcuts(x, schema.props)
+                types += 1
+        finally:
+            bpy.data.objects.remove(obj)
+            bpy.data.meshes.remove(mesh)
+
+        # Save all generated shortcuts at once.
+        flush_shortcuts()
+        self.report({'INFO'}, f"Generated shortcuts for {types} types")
+        return {'FINISHED'}
@@ -0,0 +1,90 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import json
+import logging
+
+from bpy.props import BoolProperty, IntProperty, StringProperty
+from bpy.types import Operator
+from libemtk.modifiers_operator import ModifiersOperator
+
+from ..utils.clusters import create_modifiers_list, get_cluster_types
+from ..utils.evaluation import (format_cost, measure_clusters_cost,
+                                measure_modifiers_cost)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class EMTK_OT_profile_clusters(ModifiersOperator, Operator):
+    """
+    Measures how much every cluster and modifier adds to depsgraph
+    evaluation time. Measured modifiers costs are used by proxy
+    evaluation.
+
+    Can be used in background mode, for example:
+    blender -b file.blend --python-expr "import bpy;
+    bpy.ops.emtk.profile_clusters(all_objects=True, output='costs.json')"
+    """
+
+    bl_idname = "emtk.profile_clusters"
+    bl_label = "Profile clusters"
+    bl_description = "Measure evaluation time of every cluster"
+
+    samples: IntProperty(name="Samples", default=5, min=1)
+    all_objects: BoolProperty(
+        name="Profile all objects in view layer", default=False)
+    output: StringProperty(
+        name="Save results to json file", default='', subtype='FILE_PATH')
+
+    @classmethod
+    def poll(cls, context):
+        return context.view_layer is not None
+
+    def execute(self, context):
+        if self.all_objects:
+            cluster_types = get_cluster_types()
+            m_lists = []
+            for x in context.view_layer.objects:
+                if x.type == 'MESH' and len(x.modifiers) > 0:
+                    m_lists.append(create_modifiers_list(x, cluster_types))
+        elif self.create_objects_modifiers_lists(context):
+            m_lists = self.selected_objects
+        else:
+            m_lists = []
+
+        if len(m_lists) == 0:
+            self.report({'ERROR'}, "No objects with modifiers")
+            return {'CANCELLED'}
+
+        result = {}
+        for m_list in m_lists:
+            obj = m_list._object
+            costs = measure_clusters_cost(context, m_list, self.samples)
+            measure_modifiers_cost(context, obj, samples=self.samples)
+            result.update({obj.name: costs})
+            for x, y in costs.items():
+                logger.info(f'{obj.name} {x} {format_cost(y)}')
+
+        if len(self.output) > 0:
+            with open(self.output, 'w') as f:
+                json.dump(result, f, indent=4)
+
+        self.report({'INFO'}, f"Profiled {len(m_lists)} objects")
+        return {'FINISHED'}
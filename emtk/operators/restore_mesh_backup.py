@@ -0,0 +1,53 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+from bpy.types import Operator
+
+from ..utils.mesh_backup import ArrayMeshBackupStore, MeshBackupStore
+
+
+class EMTK_OT_restore_mesh_backup(Operator):
+    bl_idname = "emtk.restore_mesh_backup"
+    bl_label = "Restore mesh backup"
+    bl_description = "Replace active object mesh with its latest backup"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        if context.mode != 'OBJECT':
+            return False
+        elif context.object is None:
+            return False
+        elif context.object.type != 'MESH':
+            return False
+        return True
+
+    def execute(self, context):
+        prefs = context.preferences.addons['emtk'].preferences
+        budget = prefs.backup_memory_budget * 1024 * 1024
+        if prefs.backup_mode == 'ARRAYS':
+            backups = ArrayMeshBackupStore(budget)
+        else:
+            backups = MeshBackupStore(prefs.backup_collection_name, budget)
+
+        if not backups.restore(context.object):
+            self.report({'ERROR'}, "No mesh backups for active object")
+            return {'CANCELLED'}
+        self.report({'INFO'}, "Restored mesh backup")
+        return {'FINISHED'}
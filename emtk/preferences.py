@@ -24,6 +24,8 @@ from bpy.props import (BoolProperty, EnumProperty, FloatProperty, IntProperty,
 from bpy.types import AddonPreferences
 from modal_shortcuts.preferences import ModalShortcutsPreferences
 
+from .utils.shortcuts_index import flush_shortcuts, invalidate_shortcuts_index
+
 
 class EMTKPreferences(ModalShortcutsPreferences, AddonPreferences):
     bl_idname = "emtk"
@@ -43,6 +45,18 @@ class EMTKPreferences(ModalShortcutsPreferences, AddonPreferences):
         name="Save clusters on operator finish",
         default=True)
 
+    broadcast_edits: BoolProperty(
+        name="Broadcast edits to selected objects",
+        description="Replay EMTKM edits on clusters with same name and "
+        "type on all selected objects",
+        default=False)
+
+    deferred_save_clusters: BoolProperty(
+        name="Save clusters after operator finished",
+        description="Save changed clusters from timer, "
+        "so that operator finishes without waiting for it",
+        default=False)
+
     save_clusters_backup: BoolProperty(
         name="Save clusters backup on operator finish",
         default=True)
@@ -55,6 +69,34 @@ class EMTKPreferences(ModalShortcutsPreferences, AddonPreferences):
         name="Name of collection that will be used for mesh backup.",
         default='EMTKM mesh backup')
 
+    backup_mode: EnumProperty(
+        name="Mesh backup mode",
+        items=[('COLLECTION', 'Collection',
+                'Store objects copies in backup collection', 'CUBE', 0),
+               ('ARRAYS', 'Arrays',
+                'Store meshes arrays in files next to .blend file',
+                'FILE', 1),
+               ],
+        default='COLLECTION')
+
+    backup_memory_budget: IntProperty(
+        name="Max size of mesh backups (MB).",
+        default=256,
+        min=1)
+
+    coalesce_mouse_input: BoolProperty(
+        name="Write mouse input to properties once per evaluation.",
+        default=False)
+
+    proxy_evaluation: BoolProperty(
+        name="Degrade expensive modifiers while editing values.",
+        default=False)
+
+    proxy_evaluation_threshold: FloatProperty(
+        name="Modifier evaluation cost to degrade it (ms).",
+        default=10.0,
+        min=0.0)
+
     custom_cluster_types: BoolProperty(
         name="Use custom cluster types.",
         default=True)
@@ -71,6 +113,51 @@ class EMTKPreferences(ModalShortcutsPreferences, AddonPreferences):
         name="Clusters list popup width",
         default=400)
 
+    operator_feedback: EnumProperty(
+        name="Operator feedback",
+        items=[('OVERLAY', 'Overlay',
+                'Draw clusters and editor info in viewport', 'OVERLAY', 0),
+               ('STATUSBAR', 'Statusbar',
+                'Show one line with active cluster and editor info '
+                'in statusbar', 'INFO', 1),
+               ('BOTH', 'Overlay and statusbar',
+                'Use both overlay and statusbar', 'WINDOW', 2),
+               ],
+        default='OVERLAY')
+
+    overlay_windowed_list: BoolProperty(
+        name="Show only clusters around active one in overlay",
+        description="Build overlay lines only for clusters that fit "
+        "into viewport and collapse other layers",
+        default=True)
+
+    overlay_objects: EnumProperty(
+        name="Objects in overlay",
+        items=[('ACTIVE', 'Active object',
+                'Show clusters of active object', 'OBJECT_DATA', 0),
+               ('ALL', 'Selected objects',
+                'Show clusters of all selected objects', 'GROUP', 1),
+               ('SUMMARY', 'Selected objects summary',
+                'Show clusters count and cost of all selected objects',
+                'LINENUMBERS_ON', 2),
+               ],
+        default='ACTIVE')
+
+    overlay_max_refresh_rate: IntProperty(
+        name="Max overlay refresh rate per second",
+        default=30,
+        min=1,
+        max=240)
+
+    def refresh_cache(self):
+        """Refreshes shortcuts cache and invalidates shortcuts index,
+        which references shortcuts groups from previous cache.
+        """
+        flush_shortcuts()
+        result = super().refresh_cache()
+        invalidate_shortcuts_index()
+        return result
+
     def draw(self, context):
         layout = self.layout
         if self.needs_restart:
@@ -89,11 +176,21 @@ class EMTKPreferences(ModalShortcutsPreferences, AddonPreferences):
         layout = self.layout
         layout.label(text="General settings")
         layout.prop(self, "save_clusters")
+        if self.save_clusters:
+            layout.prop(self, "deferred_save_clusters")
         if self.save_clusters_backup:
             layout.prop(self, "save_clusters_backup")
         layout.prop(self, "backup_mesh_on_modifier_apply_remove")
         if self.backup_mesh_on_modifier_apply_remove:
-            layout.prop(self, "backup_collection_name")
+            layout.prop(self, "backup_mode")
+            if self.backup_mode == 'COLLECTION':
+                layout.prop(self, "backup_collection_name")
+            layout.prop(self, "backup_memory_budget")
+        layout.prop(self, "broadcast_edits")
+        layout.prop(self, "coalesce_mouse_input")
+        layout.prop(self, "proxy_evaluation")
+        if self.proxy_evaluation:
+            layout.prop(self, "proxy_evaluation_threshold")
         layout.prop(self, "custom_cluster_types")
         if self.custom_cluster_types:
             layout.prop(self, "always_add_custom_cluster_types")
@@ -101,9 +198,14 @@ class EMTKPreferences(ModalShortcutsPreferences, AddonPreferences):
         layout.prop(self, "emtk_modal_operators_serialized_shortcuts")
 
     def __draw_shortcuts_search(self, context):
+        self.layout.operator("emtk.generate_modal_shortcuts")
         return self.draw_shortcuts_search(context)
 
     def __draw_additional_settings(self, context):
         layout = self.layout
         layout.label(text="Additional settings")
         layout.prop(self, "clusters_list_popup_width")
+        layout.prop(self, "operator_feedback")
+        layout.prop(self, "overlay_max_refresh_rate")
+        layout.prop(self, "overlay_windowed_list")
+        layout.prop(self, "overlay_objects")
@@ -27,9 +27,11 @@ import bpy
 from bpy.props import BoolProperty, FloatProperty, IntProperty, StringProperty
 from bpy.types import Operator
 from class_variables_editor_ui.panel import UIClassVariablesEditor
-from libemtk.modifiers_operator import ModifiersOperator
 from libemtk.utils.modifier_prop_types import get_all_editable_props
 
+from ..classes.cached_modifiers_operator import CachedModifiersOperator
+from ..utils.evaluation import format_cost, get_clusters_cost
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
@@ -37,7 +39,7 @@ USE_PROFILER = False
 
 
 class EMTK_OT_clusters_list_popup(
-        UIClassVariablesEditor, ModifiersOperator, Operator):
+        UIClassVariablesEditor, CachedModifiersOperator, Operator):
     bl_idname = "emtk.clusters_list_popup"
     bl_label = "View and edit active object's clusters."
 
@@ -81,8 +83,12 @@ class EMTK_OT_clusters_list_popup(
         cls.iteration += 1
         layout = self.layout
         layout.label(text='libemtk')
+        layout.operator('emtk.profile_clusters', text='Profile clusters')
         box = layout.box()
 
+        # Profiled clusters costs, if any.
+        cls.costs = get_clusters_cost(cls.m_list._object)
+
         if USE_PROFILER and cls.iteration in {1, 10, 100}:
             c = 'self._EMTK_OT_clusters_list_popup__draw_clusters_list(box, cls.m_list)'
             print('Profiler stats for clusters list popup ')
@@ -119,6 +125,10 @@ class EMTK_OT_clusters_list_popup(
                           text=cluster.name, icon=icon)
         op.func = line
 
+        # Profiled cost
+        if cluster.name in self.costs:
+            row.label(text=format_cost(self.costs[cluster.name]))
+
         # Actions
         # Move down
         line = f'self.m_list.get_cluster_or_layer(self.m_list.find_cluster_by_name("{cluster.name}")).\
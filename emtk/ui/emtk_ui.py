@@ -17,11 +17,21 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
+import logging
+
 # import bpy
 import blf
 
+from ..classes.ui_snapshot import UISnapshot
+from ..utils.evaluation import (format_cost, get_clusters_cost,
+                                get_stack_fingerprint)
+
 # import math
 
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# logger.setLevel(logging.DEBUG)
+
 
 # class ClustersListUI():
 #     def __init__(self, clusters_list):
@@ -40,64 +50,80 @@ import blf
 #         elif isinstance(x, OperatorInfoUI):
 #             draw_operator_info(x, context)
 
-def emtk_modifier_ui_draw(self, context):
-    ui_t = self.emtk_ui(context)
+# Position of first overlay line and distance between lines.
+_UI_TOP = 450
+_UI_LINE_HEIGHT = 18
+
+# Text styles of overlay lines.
+# {style: (size, dpi, color)}
+_UI_STYLES = {
+    'TEXT': (32, 30, (0.95, 0.95, 0.95, 1)),
+    1: (32, 30, (0.95, 0.95, 0.95, 1)),
+    2: (32, 30, (0.8, 0.7, 0.7, 1)),
+    3: (32, 30, (0.8, 0.8, 0.95, 1)),
+    10: (32, 30, (0.8, 0.8, 0.5, 1)),
+    20: (32, 30, (0.95, 0.95, 0.95, 1)),
+    'ERROR': (32, 30, (0.95, 0.95, 0.2, 1)),
+}
+
+
+def emtk_ui_draw_list(ui_t) -> dict:
+    """Returns {style: [(x, y, text)]} dict with positioned lines."""
+    runs = {}
     offset = 0
     offset_2 = 0
     for x in ui_t:
-        font_id = 0
-        if isinstance(x, list) and x[1] == 20:
-            blf.position(font_id, 400, 600 + offset_2, 0)
+        if isinstance(x, str):
+            style = 'TEXT'
+            text = x
+        elif isinstance(x, list) and len(x) == 2 and x[1] in _UI_STYLES:
+            style = x[1]
+            text = x[0]
         else:
-            blf.position(font_id, 30, 450 + offset, 0)
+            style = 'ERROR'
+            text = "Encountered error while drawing text"
 
-        e = False
-
-        if isinstance(x, str):
-            blf.size(font_id, 32, 30)
-            blf.color(font_id, 0.95, 0.95, 0.95, 1)
-            blf.draw(font_id, x)
-            offset -= 18
-
-        elif isinstance(x, list):
-            if len(x) == 2:
-                if x[1] == 2:
-                    blf.size(font_id, 32, 30)
-                    blf.color(font_id, 0.8, 0.7, 0.7, 1)
-                    blf.draw(font_id, x[0])
-                    offset -= 18
-                elif x[1] == 1:
-                    blf.size(font_id, 32, 30)
-                    blf.color(font_id, 0.95, 0.95, 0.95, 1)
-                    blf.draw(font_id, x[0])
-                    offset -= 18
-                elif x[1] == 3:
-                    blf.size(font_id, 32, 30)
-                    blf.color(font_id, 0.8, 0.8, 0.95, 1)
-                    blf.draw(font_id, x[0])
-                    offset -= 18
-                elif x[1] == 10:
-                    blf.size(font_id, 32, 30)
-                    blf.color(font_id, 0.8, 0.8, 0.5, 1)
-                    blf.draw(font_id, x[0])
-                    offset -= 18
-                elif x[1] == 20:
-                    blf.size(font_id, 32, 30)
-                    blf.color(font_id, 0.95, 0.95, 0.95, 1)
-                    blf.draw(font_id, x[0])
-                    offset_2 -= 18
-                else:
-                    e = True
-            else:
-                e = True
+        if style == 20:
+            runs.setdefault(style, []).append((400, 600 + offset_2, text))
+            offset_2 -= _UI_LINE_HEIGHT
         else:
-            e = True
+            runs.setdefault(style, []).append((30, _UI_TOP + offset, text))
+            offset -= _UI_LINE_HEIGHT
+    return runs
 
-        if e:
-            blf.size(font_id, 32, 30)
-            blf.color(font_id, 0.95, 0.95, 0.2, 1)
-            blf.draw(font_id, "Encountered error while drawing text")
-            offset -= 18
+
+def emtk_modifier_ui_draw(self, context):
+    """Draws overlay lines.
+
+    Lines are stored per region, and rebuilt only when operator
+    UI version or region height changes.
+    """
+    try:
+        version = (self.get_ui_version(), context.region.height)
+        region = context.region.as_pointer()
+    except AttributeError:
+        version = None
+        region = None
+
+    # {region pointer: [version, draw list]}
+    draw_lists = getattr(self, 'ui_draw_lists', None)
+    if draw_lists is None:
+        draw_lists = {}
+        self.ui_draw_lists = draw_lists
+
+    draw_list = draw_lists.get(region)
+    if version is None or draw_list is None or draw_list[0] != version:
+        draw_list = [version, emtk_ui_draw_list(self.emtk_ui(context))]
+        draw_lists.update({region: draw_list})
+
+    font_id = 0
+    for style, runs in draw_list[1].items():
+        size, dpi, color = _UI_STYLES[style]
+        blf.size(font_id, size, dpi)
+        blf.color(font_id, *color)
+        for x, y, text in runs:
+            blf.position(font_id, x, y, 0)
+            blf.draw(font_id, text)
 
 
 class EMTKUi:
@@ -114,6 +140,11 @@ class EMTKUi:
     # Show all objects mods
     _EMTK_UI_SHOW_ALL_OBJECTS = False
 
+    # Show only one line for every object
+    _EMTK_UI_OBJECTS_SUMMARY = False
+
+    __OBJECTS_MODES = {'ACTIVE', 'ALL', 'SUMMARY'}
+
     # Prints info about operator in statusbar
     # TODO: remove this method.
     def emtk_stats(self, context):
@@ -124,6 +155,11 @@ class EMTKUi:
         for x in self.emtk_stats_list(context):
             ui_t += x
             ui_t += " "
+
+        # Avoid redrawing headers, if nothing changed.
+        if ui_t == getattr(self, 'emtk_stats_text', None):
+            return
+        self.emtk_stats_text = ui_t
         context.workspace.status_text_set(ui_t)
 
     # TODO: remove this method.
@@ -134,7 +170,7 @@ class EMTKUi:
         Should return list of strings
         """
         ui_t = []
-        for line in self.emtk_ui_list(context):
+        for line in self.emtk_ui_list():
             ui_t.append(line)
         ui_t.append(" ")
         ui_t.append("No operator-specific emtk_ui method")
@@ -151,10 +187,27 @@ class EMTKUi:
         ui_t.append("No emtk_ui_modifier_stats method")
         return ui_t
 
+    def emtk_ui_max_lines(self, context) -> int:
+        """Returns number of overlay lines that fit into region."""
+        return min(context.region.height, _UI_TOP) // _UI_LINE_HEIGHT
+
+    def emtk_ui_set_objects_mode(self, mode: str) -> None:
+        """Sets objects shown in overlay.
+
+        mode is 'ACTIVE', 'ALL' or 'SUMMARY'.
+        """
+        if mode not in self.__OBJECTS_MODES:
+            raise ValueError
+        self._EMTK_UI_SHOW_ALL_OBJECTS = mode != 'ACTIVE'
+        self._EMTK_UI_OBJECTS_SUMMARY = mode == 'SUMMARY'
+
     # TODO: remove this method.
-    def emtk_ui_list(self):
+    def emtk_ui_list(self, max_lines=None):
         """
         Returns list of lines with info about modifiers
+
+        If max_lines is set, only clusters around active one
+        are shown.
         """
 
         ui_t = []
@@ -162,100 +215,288 @@ class EMTKUi:
         # List of modifiers
         if self._EMTK_UI_SHOW_ALL_OBJECTS:
             for y in self.selected_objects:
-                for x in self.emtk_ui_modifiers_list(y):
+                for x in self.__get_object_lines(y):
                     ui_t.append(x)
+            if self._EMTK_UI_OBJECTS_SUMMARY:
                 ui_t.append(" ")
         else:
-            for x in self.emtk_ui_modifiers_list(self.m_list):
+            if max_lines is not None:
+                max_lines -= 1
+            for x in self.emtk_ui_modifiers_list(self.m_list, max_lines):
                 ui_t.append(x)
             ui_t.append(" ")
         return ui_t
 
+    def __get_object_lines(self, m_list) -> list:
+        """Returns cached lines of m_list in all objects overlay.
+
+        Lines are rebuilt only when object modifiers or profiled
+        costs change. Lines of active object are also rebuilt every
+        time UI state version changes.
+        """
+        obj = m_list._object
+        active = m_list is self.m_list
+        version = None
+        if active:
+            version = self.__get_ui_version()
+        costs = get_clusters_cost(obj)
+        key = (get_stack_fingerprint(obj), costs, version,
+               self._EMTK_UI_OBJECTS_SUMMARY)
+
+        try:
+            cache = self.__emtk_ui_objects_lines
+        except AttributeError:
+            cache = self.__emtk_ui_objects_lines = {}
+
+        x = cache.get(m_list)
+        # Without UI version, changes of active object are unknown.
+        if x is not None and x[0] == key\
+                and (version is not None or not active):
+            return x[1]
+
+        if self._EMTK_UI_OBJECTS_SUMMARY:
+            ui_t = [self.__get_object_summary(m_list, costs)]
+        else:
+            ui_t = self.emtk_ui_modifiers_list(m_list)
+            ui_t.append(" ")
+        cache.update({m_list: [key, ui_t]})
+        logger.debug(f'Built overlay lines of {obj.name}')
+        return ui_t
+
+    def __get_object_summary(self, m_list, costs):
+        """Returns line with clusters count and cost of m_list."""
+        obj = m_list._object
+        if m_list is self.m_list:
+            y = ">"
+        else:
+            y = "  "
+        line = f"{y} {obj.name}: {len(m_list)} clusters, "\
+            f"{len(obj.modifiers)} modifiers"
+
+        # Profiled cost of top level clusters.
+        cost = sum(costs[x.name] for x in m_list if x.name in costs)
+        if costs:
+            line = f"{line}, {format_cost(cost)}"
+
+        if m_list is self.m_list:
+            return [line, 10]
+        return [line, 1]
+
     # UI utils
     # TODO: remove this method.
-    def emtk_ui_modifiers_list(self, m_list):
+    def emtk_ui_modifiers_list(self, m_list, max_lines=None):
         """
         Returns list of strings with info about m_list
+
+        If max_lines is set, only clusters that fit into it are shown.
         """
 
         ui_t = []
 
-        m_name = m_list.get_cluster().name
-        m_type = m_list.get_cluster().type
-
-        layer = m_list.get_layer()
+        snapshot = self.__get_ui_snapshot(m_list)
 
         ui_t.append("=============================")
         ui_t.append("       CLUSTERS LIST")
         ui_t.append("=============================")
-        for x in m_list:
-            ui_t += self._emtk_ui_get_cluster_ui(
-                x, layer.get_selection(), m_list, m_name, m_type)
+        if max_lines is None:
+            for x in m_list:
+                ui_t += self._emtk_ui_get_cluster_ui(x, snapshot)
+        else:
+            ui_t += self.__get_window_lines(snapshot, max_lines - 4)
         ui_t.append("=============================")
         return ui_t
 
-    # TODO: remove this method.
-    def _emtk_ui_get_cluster_ui(
-            self, cluster, cluster_selection, m_list, m_name, m_type):
+    def __get_window_lines(self, snapshot, max_lines):
+        """Returns lines of clusters around deepest active cluster."""
+        return self.__get_layer_window(snapshot.m_list, snapshot, max_lines)
+
+    def __get_layer_window(self, layer, snapshot, max_lines):
+        """Returns lines of layer clusters around its active one.
 
-        if cluster in cluster_selection:
-            cluster_selected = True
+        Active layer is windowed recursively, down to deepest active
+        cluster. Other clusters are added below and above active one,
+        until their lines don't fit into max_lines, so clusters out of
+        window are never visited. Layers other than active one are
+        shown collapsed.
+        """
+        # Markers take two lines.
+        max_lines -= 2
+
+        active = layer.active
+        flags = snapshot.get_flags(active)
+        if flags.has_clusters and flags.collapsed is False:
+            # Header, separators and empty line take four lines.
+            lines = [self.__get_cluster_header(active, flags, snapshot),
+                     "------------------------------"]
+            lines += self.__get_layer_window(
+                active, snapshot, max_lines - 4)
+            lines += ["------------------------------", ""]
         else:
-            cluster_selected = False
+            lines = self._emtk_ui_get_cluster_ui(active, snapshot)
+
+        i = layer.index(active)
+        n = len(lines)
+        above = []
+        below = []
+        first = i
+        last = i
+        full = False
+        while not full and (first > 0 or last < len(layer) - 1):
+            for j in (last + 1, first - 1):
+                if not 0 <= j < len(layer):
+                    continue
+                x = self.__get_distant_cluster_ui(layer[j], snapshot)
+                if n + len(x) > max_lines:
+                    full = True
+                    break
+                n += len(x)
+                if j > i:
+                    below += x
+                    last = j
+                else:
+                    above = x + above
+                    first = j
 
-        # Info about cluster
         ui_t = []
-        if cluster.type == m_type:
-            y = "<"
-        else:
-            y = "  "
-        if cluster.name == m_name:
-            y2 = ">"
-        else:
-            y2 = "  "
+        if first > 0:
+            ui_t.append([f"{first} more clusters above", 2])
+        ui_t += above
+        ui_t += lines
+        ui_t += below
+        if last < len(layer) - 1:
+            ui_t.append([f"{len(layer) - last - 1} more clusters below", 2])
+        return ui_t
 
-        y5 = cluster.get_this_cluster_tags()
-        if len(y5) == 0:
-            y5 = ''
+    def __get_distant_cluster_ui(self, cluster, snapshot):
+        """Returns cluster lines with layers collapsed."""
+        flags = snapshot.get_flags(cluster)
+        if flags.has_clusters and flags.collapsed is False:
+            return [self.__get_cluster_header(cluster, flags, snapshot),
+                    "layer collapsed", ""]
+        return self._emtk_ui_get_cluster_ui(cluster, snapshot)
+
+    def emtk_ui_clusters_changed(self, change):
+        """Removes lines of changed clusters from cache."""
+        cache = self.__get_ui_lines_cache()
+        for x in change.clusters:
+            cache.pop(x, None)
+        logger.debug(f'Removed {len(change.clusters)} clusters lines.')
+
+    def __get_ui_lines_cache(self) -> dict:
+        """Returns {cluster: [key, lines]} dict."""
+        try:
+            return self.__emtk_ui_lines
+        except AttributeError:
+            self.__emtk_ui_lines = {}
+            return self.__emtk_ui_lines
+
+    def __get_ui_snapshot(self, m_list) -> UISnapshot:
+        """Returns snapshot of m_list for current UI state version.
+
+        Operators without UI version get new snapshot every time.
+        """
+        version = self.__get_ui_version()
+        try:
+            snapshots = self.__emtk_ui_snapshots
+        except AttributeError:
+            snapshots = self.__emtk_ui_snapshots = {}
+
+        x = snapshots.get(id(m_list))
+        if version is None or x is None or x.version != version\
+                or x.m_list is not m_list:
+            x = UISnapshot(version, m_list,
+                           m_list.get_layer().get_selection(),
+                           get_clusters_cost(m_list._object))
+            snapshots.update({id(m_list): x})
+        return x
+
+    def __get_ui_version(self):
+        """Returns operator UI version, or None if there is none."""
+        try:
+            return self.get_ui_version()
+        except AttributeError:
+            return None
+
+    def _emtk_ui_get_cluster_ui(self, cluster, snapshot):
+        flags = snapshot.get_flags(cluster)
+
+        # Lines of modifiers clusters are reused, until cluster changes.
+        if not flags.has_clusters:
+            cost = None
+            if snapshot.costs:
+                cost = snapshot.costs.get(cluster.name)
+            key = (cluster.name, snapshot.is_selected(cluster),
+                   cluster.name == snapshot.m_name,
+                   cluster.type == snapshot.m_type,
+                   flags.collapsed, cost,
+                   tuple(mod.name for mod in cluster))
+            cache = self.__get_ui_lines_cache()
+            x = cache.get(cluster)
+            if x is not None and x[0] == key:
+                return x[1]
+            ui_t = self.__get_cluster_lines(cluster, flags, snapshot)
+            cache.update({cluster: [key, ui_t]})
+            return ui_t
+
+        return self.__get_cluster_lines(cluster, flags, snapshot)
+
+    def __get_cluster_lines(self, cluster, flags, snapshot):
 
-        if cluster.has_clusters():
-            y3 = "L"
-            if cluster_selected:
-                ui_t.append([f"{y2} {cluster.name} {y3} {y} {y5}", 10])
-            else:
-                ui_t.append([f"{y2} {cluster.name} {y3} {y} {y5}", 1])
-        else:
-            y3 = "C"
-            if cluster_selected:
-                ui_t.append([f"{y2} {cluster.name} {y3} {y} {y5}", 10])
-            else:
-                ui_t.append([f"{y2} {cluster.name} {y3} {y} {y5}", 3])
+        # Info about cluster
+        ui_t = [self.__get_cluster_header(cluster, flags, snapshot)]
 
         # Info about its clusters
-        if cluster.has_clusters() and cluster.instance_data['collapsed'] is False:
+        if flags.has_clusters and flags.collapsed is False:
             ui_t.append("------------------------------")
             for x in cluster:
-                ui_t += self._emtk_ui_get_cluster_ui(
-                    x, cluster_selection, m_list, m_name, m_type)
+                ui_t += self._emtk_ui_get_cluster_ui(x, snapshot)
 
             ui_t.append("------------------------------")
-        elif cluster.has_clusters() and cluster.instance_data['collapsed'] is True:
+        elif flags.has_clusters and flags.collapsed is True:
             ui_t.append("layer collapsed")
 
         # Info about its modifiers
-        elif not cluster.has_clusters()\
-                and cluster.instance_data['collapsed'] is False:
+        elif not flags.has_clusters and flags.collapsed is False:
             ui_t.append("------------------------------")
             for mod in cluster:
                 ui_t.append([f"{mod.name}", 2])
             ui_t.append("------------------------------")
-        elif not cluster.has_clusters()\
-                and cluster.instance_data['collapsed'] is True:
+        elif not flags.has_clusters and flags.collapsed is True:
             ui_t.append("modifiers cluster collapsed")
 
         ui_t.append("")
         return ui_t
 
+    def __get_cluster_header(self, cluster, flags, snapshot):
+        """Returns line with info about cluster."""
+        if cluster.type == snapshot.m_type:
+            y = "<"
+        else:
+            y = "  "
+        if cluster.name == snapshot.m_name:
+            y2 = ">"
+        else:
+            y2 = "  "
+
+        y5 = flags.tags
+
+        # Profiled cost
+        if snapshot.costs and cluster.name in snapshot.costs:
+            y5 = f"{y5} {format_cost(snapshot.costs[cluster.name])}"
+
+        if flags.has_clusters:
+            y3 = "L"
+            if snapshot.is_selected(cluster):
+                return [f"{y2} {cluster.name} {y3} {y} {y5}", 10]
+            else:
+                return [f"{y2} {cluster.name} {y3} {y} {y5}", 1]
+        else:
+            y3 = "C"
+            if snapshot.is_selected(cluster):
+                return [f"{y2} {cluster.name} {y3} {y} {y5}", 10]
+            else:
+                return [f"{y2} {cluster.name} {y3} {y} {y5}", 3]
+
     # TODO: remove this method.
     def emtk_ui_cluster_visibility(self, cluster):
         line = " "
@@ -0,0 +1,127 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Batched reading and writing of modifiers properties.
+
+Modifiers are grouped by owning object. Values of every group are
+written with single foreach_set call, if all modifiers of object
+have the same type. Otherwise values are written one by one.
+
+foreach_set always covers whole modifiers collection, so it can't
+be used for part of mixed stack, or across objects. In practice
+it is only used for objects with many modifiers of one type, for
+example arrays of Smooth or Displace modifiers. Typical stacks,
+like one Bevel per object, use setattr.
+"""
+
+import logging
+
+import numpy
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# logger.setLevel(logging.DEBUG)
+
+# Property types that can be written with foreach_set.
+_BUFFER_TYPES = {
+    'BOOLEAN': bool,
+    'INT': numpy.int32,
+    'FLOAT': numpy.float32,
+}
+
+
+def get_props_values(mods, prop) -> list:
+    """Returns list of prop values for every modifier.
+
+    prop is PropSchema.
+    """
+    values = {}
+    for obj, items in _group_by_object(mods).items():
+        coll = obj.modifiers
+        if _can_use_buffer(coll, items, prop):
+            buf = numpy.empty(len(coll), dtype=_BUFFER_TYPES[prop.type])
+            coll.foreach_get(prop.name, buf)
+            for i, mod in items:
+                values.update({(obj, mod.name): buf[i].item()})
+        else:
+            for i, mod in items:
+                values.update({(obj, mod.name): getattr(mod, prop.name)})
+    return [values[(x.id_data, x.name)] for x in mods]
+
+
+def set_props_values(mods, prop, values) -> None:
+    """Sets prop of every modifier to value with same index.
+
+    prop is PropSchema. values can be a list or a single value.
+    """
+    if not isinstance(values, list):
+        values = [values] * len(mods)
+    if len(values) != len(mods):
+        raise ValueError
+
+    new_values = {}
+    for mod, val in zip(mods, values):
+        new_values.update({(mod.id_data, mod.name): val})
+
+    for obj, items in _group_by_object(mods).items():
+        coll = obj.modifiers
+        if _can_use_buffer(coll, items, prop):
+            buf = numpy.empty(len(coll), dtype=_BUFFER_TYPES[prop.type])
+            coll.foreach_get(prop.name, buf)
+            for i, mod in items:
+                buf[i] = new_values[(obj, mod.name)]
+            coll.foreach_set(prop.name, buf)
+
+            # foreach_set does not call properties update.
+            obj.update_tag()
+        else:
+            for i, mod in items:
+                setattr(mod, prop.name, new_values[(obj, mod.name)])
+
+
+def _group_by_object(mods) -> dict:
+    """Returns {object: [(modifier index, modifier)]} dict."""
+    result = {}
+    indices = {}
+    for mod in mods:
+        obj = mod.id_data
+        if obj not in result:
+            result.update({obj: []})
+            index = {}
+            for i, x in enumerate(obj.modifiers.keys()):
+                index.update({x: i})
+            indices.update({obj: index})
+        result[obj].append((indices[obj][mod.name], mod))
+    return result
+
+
+def _can_use_buffer(coll, items, prop) -> bool:
+    """Checks if modifiers collection can be written at once."""
+    if prop.type not in _BUFFER_TYPES or prop.is_array:
+        return False
+    if len(items) < 2:
+        return False
+
+    # All modifiers in collection should have this prop.
+    t = items[0][1].type
+    for x in coll:
+        if x.type != t:
+            return False
+    return True
@@ -0,0 +1,46 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import bpy
+from libemtk.lists.extended_modifiers_list import ExtendedModifiersList
+from libemtk.utils.clusters import (
+    get_cluster_types_definitions_from_settings,
+    instantiate_clusters_from_definitions)
+
+
+def get_cluster_types() -> list:
+    """Returns instances of cluster types enabled in addon preferences.
+
+    Same cluster types are used by ModifiersOperator.
+    """
+    prefs = bpy.context.preferences.addons['emtk'].preferences
+    if prefs.custom_cluster_types and prefs.always_add_custom_cluster_types:
+        clusters = get_cluster_types_definitions_from_settings('emtk')
+        return instantiate_clusters_from_definitions(clusters)
+    return []
+
+
+def create_modifiers_list(obj, cluster_types=None):
+    """Returns parsed ExtendedModifiersList for object.
+
+    Can be used without operator and selected objects.
+    """
+    if cluster_types is None:
+        cluster_types = get_cluster_types()
+    return ExtendedModifiersList(obj, cluster_types=cluster_types)
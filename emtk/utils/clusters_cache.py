@@ -0,0 +1,168 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Process-wide cache of parsed ExtendedModifiersList instances.
+
+Lists are stored per object pointer together with fingerprint of
+object modifiers stack and cluster types that were used to parse it.
+Lists with different fingerprint, or lists that reference another
+object, are parsed again.
+"""
+
+import logging
+
+import bpy
+from bpy.app.handlers import persistent
+
+from .clusters import create_modifiers_list, get_cluster_types
+from .clusters_state import clear_saved_state, clusters_state_depsgraph_handler
+from .evaluation import get_stack_fingerprint
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# logger.setLevel(logging.DEBUG)
+
+# {object pointer: [key, ExtendedModifiersList]}
+_CLUSTERS_CACHE = {}
+
+
+def get_cluster_types_key() -> tuple:
+    """Returns tuple that changes every time cluster types
+    used for parsing change.
+    """
+    prefs = bpy.context.preferences.addons['emtk'].preferences
+    return (prefs.custom_cluster_types,
+            prefs.always_add_custom_cluster_types,
+            prefs.cluster_types)
+
+
+def get_modifiers_list(obj, cluster_types=None):
+    """Returns parsed ExtendedModifiersList for object.
+
+    Object modifiers are parsed only if there is no cached list
+    for same modifiers stack and cluster types.
+    """
+    key = (get_stack_fingerprint(obj), get_cluster_types_key())
+    x = _CLUSTERS_CACHE.get(obj.as_pointer())
+    if x is not None and x[0] == key and _references(x[1], obj):
+        logger.debug(f'Using cached clusters for {obj.name}')
+        return x[1]
+
+    if cluster_types is None:
+        cluster_types = get_cluster_types()
+    m_list = create_modifiers_list(obj, cluster_types)
+    _CLUSTERS_CACHE.update({obj.as_pointer(): [key, m_list]})
+    logger.debug(f'Parsed clusters for {obj.name}')
+    return m_list
+
+
+def store_modifiers_list(m_list) -> None:
+    """Updates cached list fingerprint after list was edited."""
+    obj = m_list._object
+    key = (get_stack_fingerprint(obj), get_cluster_types_key())
+    _CLUSTERS_CACHE.update({obj.as_pointer(): [key, m_list]})
+
+
+def invalidate_modifiers_list(obj=None) -> None:
+    """Removes cached list for object, or all cached lists."""
+    if obj is None:
+        _CLUSTERS_CACHE.clear()
+    else:
+        _CLUSTERS_CACHE.pop(obj.as_pointer(), None)
+
+
+def _references(m_list, obj) -> bool:
+    """Checks if m_list was parsed from obj.
+
+    Pointer of removed object can be reused by another one.
+    """
+    try:
+        return m_list._object == obj
+    except ReferenceError:
+        return False
+
+
+# Handlers
+
+@persistent
+def clusters_cache_depsgraph_handler(scene, depsgraph):
+    """Removes cached lists of objects which modifiers were added
+    or removed.
+
+    Runs on every update, including every drag tick, so only
+    modifiers count is compared. Renamed and moved modifiers are
+    detected by get_modifiers_list.
+    """
+    if len(_CLUSTERS_CACHE) == 0:
+        return
+    for update in depsgraph.updates:
+        if not isinstance(update.id, bpy.types.Object):
+            continue
+        obj = update.id.original
+        x = _CLUSTERS_CACHE.get(obj.as_pointer())
+        if x is not None and (len(x[0][0][1]) != len(obj.modifiers)
+                              or not _references(x[1], obj)):
+            logger.debug(f'Invalidated clusters for {obj.name}')
+            del _CLUSTERS_CACHE[obj.as_pointer()]
+
+
+@persistent
+def clusters_cache_reset_handler(*args):
+    """Removes all cached lists.
+
+    Objects referenced by lists are no longer valid after
+    loading file or undo.
+    """
+    _CLUSTERS_CACHE.clear()
+    clear_saved_state()
+
+
+_RESET_HANDLERS = ['load_pre', 'undo_post', 'redo_post']
+
+
+def register_clusters_cache_handlers() -> None:
+    handlers = bpy.app.handlers
+    if clusters_cache_depsgraph_handler\
+            not in handlers.depsgraph_update_post:
+        handlers.depsgraph_update_post.append(
+            clusters_cache_depsgraph_handler)
+    if clusters_state_depsgraph_handler\
+            not in handlers.depsgraph_update_post:
+        handlers.depsgraph_update_post.append(
+            clusters_state_depsgraph_handler)
+    for x in _RESET_HANDLERS:
+        h = getattr(handlers, x)
+        if clusters_cache_reset_handler not in h:
+            h.append(clusters_cache_reset_handler)
+
+
+def unregister_clusters_cache_handlers() -> None:
+    handlers = bpy.app.handlers
+    if clusters_cache_depsgraph_handler in handlers.depsgraph_update_post:
+        handlers.depsgraph_update_post.remove(
+            clusters_cache_depsgraph_handler)
+    if clusters_state_depsgraph_handler in handlers.depsgraph_update_post:
+        handlers.depsgraph_update_post.remove(
+            clusters_state_depsgraph_handler)
+    for x in _RESET_HANDLERS:
+        h = getattr(handlers, x)
+        if clusters_cache_reset_handler in h:
+            h.remove(clusters_cache_reset_handler)
+    _CLUSTERS_CACHE.clear()
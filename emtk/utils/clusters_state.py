@@ -0,0 +1,156 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Saving clusters and modifiers state of only changed clusters.
+
+Saved state is patched in place, if modifiers stack did not change
+since last save made by this module. Clusters state is saved
+again only if clusters structure was marked as changed.
+
+Objects changed while no operator is editing them, for example
+in Properties editor, are saved in full next time.
+"""
+
+import json
+import logging
+
+import bpy
+from bpy.app.handlers import persistent
+from libemtk.object_state import ModifierState
+
+from .evaluation import get_stack_fingerprint
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# logger.setLevel(logging.DEBUG)
+
+# Same property names are used by ExtendedModifiersList.
+_CLUSTERS_PROP = 'PreviousClusters'
+_MODIFIERS_PROP = 'PreviousModifiers'
+
+# {object name: stack fingerprint of last saved state}
+_SAVED_FINGERPRINTS = {}
+
+# Ids of operators that are editing objects right now.
+_EDITING = set()
+
+
+def save_state(m_list) -> None:
+    """Saves clusters and modifiers state of all clusters."""
+    obj = m_list._object
+    m_list.save_modifiers_state()
+    m_list.save_clusters_state()
+    _SAVED_FINGERPRINTS.update({obj.name: get_stack_fingerprint(obj)})
+    logger.debug(f'Saved state of {obj.name}')
+
+
+def save_dirty_state(m_list, dirty_modifiers: set,
+                     clusters_dirty: bool = False) -> None:
+    """Saves state of modifiers with names in dirty_modifiers.
+
+    Clusters state is saved, if clusters_dirty is True, for example
+    after constructing or deconstructing clusters, which does not
+    change modifiers stack. Falls back to saving all clusters,
+    if saved state can not be patched, or object was changed
+    outside of operators since last save.
+    """
+    if not isinstance(dirty_modifiers, set):
+        raise TypeError
+
+    obj = m_list._object
+    fingerprint = get_stack_fingerprint(obj)
+    if _SAVED_FINGERPRINTS.get(obj.name) != fingerprint\
+            or _CLUSTERS_PROP not in obj\
+            or _MODIFIERS_PROP not in obj:
+        save_state(m_list)
+        return
+
+    if clusters_dirty:
+        m_list.save_clusters_state()
+        logger.debug(f'Saved clusters of {obj.name}')
+
+    if len(dirty_modifiers) == 0:
+        logger.debug(f'Nothing to save for {obj.name}')
+        return
+
+    state = json.loads(obj[_MODIFIERS_PROP])
+    mods = m_list.all_modifiers()
+    if len(state) != len(mods):
+        save_state(m_list)
+        return
+
+    for i, mod in enumerate(mods):
+        if mod.name in dirty_modifiers:
+            state[i] = ModifierState.get_data_from_obj(mod).serialize()
+    obj[_MODIFIERS_PROP] = json.dumps(state)
+    logger.debug(f'Saved {len(dirty_modifiers)} modifiers of {obj.name}')
+
+
+def save_dirty_state_deferred(m_list, dirty_modifiers: set,
+                              clusters_dirty: bool = False,
+                              delay: float = 0.1) -> None:
+    """Saves state of dirty modifiers after delay in seconds.
+
+    Used to save state after modal operator finished.
+    """
+    if not isinstance(dirty_modifiers, set):
+        raise TypeError
+
+    def save():
+        try:
+            save_dirty_state(m_list, dirty_modifiers, clusters_dirty)
+        except ReferenceError:
+            logger.info('Object was removed before saving state.')
+
+    bpy.app.timers.register(save, first_interval=delay)
+
+
+def clear_saved_state() -> None:
+    """Forgets fingerprints of saved states."""
+    _SAVED_FINGERPRINTS.clear()
+
+
+def begin_state_editing(operator) -> None:
+    """Changes of objects are made by operator, until
+    end_state_editing, and do not make saved state stale.
+    """
+    _EDITING.add(id(operator))
+
+
+def end_state_editing(operator) -> None:
+    _EDITING.discard(id(operator))
+
+
+# Handlers
+
+@persistent
+def clusters_state_depsgraph_handler(scene, depsgraph):
+    """Forgets saved state of objects changed outside of operators,
+    so that it is not patched.
+    """
+    if len(_SAVED_FINGERPRINTS) == 0 or len(_EDITING) > 0:
+        return
+    for update in depsgraph.updates:
+        if not update.is_updated_geometry\
+                or not isinstance(update.id, bpy.types.Object):
+            continue
+        name = update.id.original.name
+        if _SAVED_FINGERPRINTS.pop(name, None) is not None:
+            logger.debug(f'Saved state of {name} is stale')
@@ -0,0 +1,192 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import logging
+import statistics
+import time
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# logger.setLevel(logging.DEBUG)
+
+# Measured modifiers evaluation costs in seconds.
+# {stack fingerprint: {modifier cost key: cost}}
+_MODIFIERS_COSTS = {}
+
+# Props that change how much modifier costs to evaluate.
+_COST_PROPS = (
+    'levels', 'segments', 'count', 'iterations', 'resolution',
+    'quality', 'subdivisions', 'octree_depth', 'voxel_size',
+    'use_merge_vertices',
+)
+
+# Measured clusters evaluation costs in seconds.
+# {stack fingerprint: {cluster name: cost}}
+_CLUSTERS_COSTS = {}
+
+
+def get_stack_fingerprint(obj) -> tuple:
+    """Returns tuple that changes every time object modifiers
+    are added, removed, renamed or reordered.
+    """
+    result = []
+    for x in obj.modifiers:
+        result.append((x.name, x.type))
+    return (obj.name, tuple(result))
+
+
+def get_modifier_cost_key(mod) -> tuple:
+    """Returns tuple that changes every time modifier is renamed
+    or its props, that evaluation cost depends on, are changed.
+    """
+    props = []
+    for x in _COST_PROPS:
+        y = getattr(mod, x, None)
+        if y is not None:
+            props.append((x, y))
+    return (mod.name, mod.type, tuple(props))
+
+
+def measure_object_evaluation(context, obj, samples: int = 3) -> float:
+    """Returns median depsgraph evaluation time of object in seconds."""
+    if samples < 1:
+        raise ValueError
+    depsgraph = context.evaluated_depsgraph_get()
+    result = []
+    for x in range(samples):
+        obj.update_tag()
+        t = time.perf_counter()
+        depsgraph.update()
+        result.append(time.perf_counter() - t)
+    return statistics.median(result)
+
+
+def measure_modifiers_cost(context, obj, modifiers=None,
+                           samples: int = 3) -> dict:
+    """Measures how much every modifier adds to object evaluation time.
+
+    Every modifier is disabled in viewport one by one.
+    Disabled modifiers cost nothing.
+    Result is cached per modifiers stack fingerprint and modifier
+    cost props. Returns {modifier name: cost in seconds}.
+    """
+    if modifiers is None:
+        modifiers = list(obj.modifiers)
+    result = {}
+    base = measure_object_evaluation(context, obj, samples)
+    for x in modifiers:
+        if not x.show_viewport:
+            result.update({x.name: 0.0})
+            continue
+        x.show_viewport = False
+        try:
+            t = measure_object_evaluation(context, obj, samples)
+        finally:
+            x.show_viewport = True
+        result.update({x.name: max(base - t, 0.0)})
+    obj.update_tag()
+
+    costs = _MODIFIERS_COSTS.setdefault(get_stack_fingerprint(obj), {})
+    for x in modifiers:
+        costs.update({get_modifier_cost_key(x): result[x.name]})
+    logger.debug(f'Measured {obj.name} modifiers cost {result}')
+    return result
+
+
+def get_modifiers_cost(obj, modifiers=None) -> dict:
+    """Returns cached {modifier name: cost in seconds}.
+
+    Never measures anything, modifiers that were not profiled
+    or changed since they were are not in result.
+    """
+    if modifiers is None:
+        modifiers = list(obj.modifiers)
+    costs = _MODIFIERS_COSTS.get(get_stack_fingerprint(obj), {})
+    result = {}
+    for x in modifiers:
+        cost = costs.get(get_modifier_cost_key(x))
+        if cost is not None:
+            result.update({x.name: cost})
+    return result
+
+
+def measure_clusters_cost(context, m_list, samples: int = 3) -> dict:
+    """Measures how much every cluster of ExtendedModifiersList
+    adds to object evaluation time.
+
+    All modifiers of cluster are disabled in viewport at once.
+    Result is cached per modifiers stack fingerprint.
+    Returns {cluster name: cost in seconds}.
+    """
+    obj = m_list._object
+    result = {}
+    base = measure_object_evaluation(context, obj, samples)
+    for cluster in _get_all_clusters(m_list):
+        mods = [x for x in cluster.all_modifiers() if x.show_viewport]
+        if len(mods) == 0:
+            result.update({cluster.name: 0.0})
+            continue
+        for x in mods:
+            x.show_viewport = False
+        try:
+            t = measure_object_evaluation(context, obj, samples)
+        finally:
+            for x in mods:
+                x.show_viewport = True
+        result.update({cluster.name: max(base - t, 0.0)})
+    obj.update_tag()
+
+    _CLUSTERS_COSTS.update({get_stack_fingerprint(obj): result})
+    logger.debug(f'Measured {obj.name} clusters cost {result}')
+    return result
+
+
+def get_clusters_cost(obj) -> dict:
+    """Returns cached {cluster name: cost in seconds}.
+
+    Returns empty dict, if object stack was not profiled
+    or changed since it was.
+    """
+    return _CLUSTERS_COSTS.get(get_stack_fingerprint(obj), {})
+
+
+def clear_modifiers_costs(obj=None) -> None:
+    """Removes cached costs for object, or for all objects."""
+    for cache in [_MODIFIERS_COSTS, _CLUSTERS_COSTS]:
+        if obj is None:
+            cache.clear()
+            continue
+        for x in list(cache):
+            if x[0] == obj.name:
+                del cache[x]
+
+
+def format_cost(cost: float) -> str:
+    """Returns cost in seconds as string in ms."""
+    return f'{cost * 1000:.1f} ms'
+
+
+def _get_all_clusters(clusters_list) -> list:
+    """Returns all clusters and layers of list, recursively."""
+    result = []
+    for x in clusters_list:
+        result.append(x)
+        if x.has_clusters():
+            result.extend(_get_all_clusters(x))
+    return result
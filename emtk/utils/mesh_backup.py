@@ -0,0 +1,507 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+
+import bpy
+import numpy
+
+from .evaluation import get_stack_fingerprint
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# logger.setLevel(logging.DEBUG)
+
+# Attributes that can be stored in arrays.
+# {data type: (field, components, dtype)}
+_ATTRIBUTE_TYPES = {
+    'FLOAT': ('value', 1, numpy.float32),
+    'INT': ('value', 1, numpy.int32),
+    'INT8': ('value', 1, numpy.int32),
+    'BOOLEAN': ('value', 1, bool),
+    'FLOAT2': ('vector', 2, numpy.float32),
+    'FLOAT_VECTOR': ('vector', 3, numpy.float32),
+    'FLOAT_COLOR': ('color', 4, numpy.float32),
+    'BYTE_COLOR': ('color', 4, numpy.float32),
+}
+
+
+def get_mesh_arrays(mesh) -> dict:
+    """Returns mesh geometry and topology as numpy arrays."""
+    result = {}
+
+    x = numpy.empty(len(mesh.vertices) * 3, dtype=numpy.float32)
+    mesh.vertices.foreach_get('co', x)
+    result.update({'co': x})
+
+    x = numpy.empty(len(mesh.edges) * 2, dtype=numpy.int32)
+    mesh.edges.foreach_get('vertices', x)
+    result.update({'edges': x})
+
+    x = numpy.empty(len(mesh.loops), dtype=numpy.int32)
+    mesh.loops.foreach_get('vertex_index', x)
+    result.update({'loops': x})
+
+    x = numpy.empty(len(mesh.polygons), dtype=numpy.int32)
+    mesh.polygons.foreach_get('loop_start', x)
+    result.update({'loop_start': x})
+
+    x = numpy.empty(len(mesh.polygons), dtype=numpy.int32)
+    mesh.polygons.foreach_get('loop_total', x)
+    result.update({'loop_total': x})
+    return result
+
+
+def get_mesh_snapshot(mesh) -> dict:
+    """Returns mesh arrays, including polygons data,
+    UV layers and generic attributes.
+
+    UV layers are stored as 'uv:name', attributes as
+    'attr:name:domain:data_type'.
+    """
+    result = get_mesh_arrays(mesh)
+
+    x = numpy.empty(len(mesh.loops), dtype=numpy.int32)
+    mesh.loops.foreach_get('edge_index', x)
+    result.update({'edge_index': x})
+
+    x = numpy.empty(len(mesh.polygons), dtype=numpy.int32)
+    mesh.polygons.foreach_get('material_index', x)
+    result.update({'material_index': x})
+
+    x = numpy.empty(len(mesh.polygons), dtype=bool)
+    mesh.polygons.foreach_get('use_smooth', x)
+    result.update({'use_smooth': x})
+
+    for layer in mesh.uv_layers:
+        x = numpy.empty(len(mesh.loops) * 2, dtype=numpy.float32)
+        layer.data.foreach_get('uv', x)
+        result.update({f'uv:{layer.name}': x})
+
+    for attr in mesh.attributes:
+        if attr.name.startswith('.') or attr.name == 'position'\
+                or attr.name in mesh.uv_layers\
+                or attr.data_type not in _ATTRIBUTE_TYPES:
+            continue
+        field, components, dtype = _ATTRIBUTE_TYPES[attr.data_type]
+        x = numpy.empty(len(attr.data) * components, dtype=dtype)
+        attr.data.foreach_get(field, x)
+        name = f'attr:{attr.name}:{attr.domain}:{attr.data_type}'
+        result.update({name: x})
+    return result
+
+
+def create_mesh_from_snapshot(name: str, arrays: dict):
+    """Returns new mesh created from get_mesh_snapshot arrays."""
+    mesh = bpy.data.meshes.new(name)
+
+    mesh.vertices.add(len(arrays['co']) // 3)
+    mesh.vertices.foreach_set('co', arrays['co'])
+    mesh.edges.add(len(arrays['edges']) // 2)
+    mesh.edges.foreach_set('vertices', arrays['edges'])
+    mesh.loops.add(len(arrays['loops']))
+    mesh.loops.foreach_set('vertex_index', arrays['loops'])
+    if 'edge_index' in arrays:
+        mesh.loops.foreach_set('edge_index', arrays['edge_index'])
+    mesh.polygons.add(len(arrays['loop_start']))
+    mesh.polygons.foreach_set('loop_start', arrays['loop_start'])
+    mesh.polygons.foreach_set('loop_total', arrays['loop_total'])
+    if 'material_index' in arrays:
+        mesh.polygons.foreach_set(
+            'material_index', arrays['material_index'])
+    if 'use_smooth' in arrays:
+        mesh.polygons.foreach_set('use_smooth', arrays['use_smooth'])
+
+    for x in arrays:
+        if x.startswith('uv:'):
+            layer = mesh.uv_layers.new(name=x[3:])
+            layer.data.foreach_set('uv', arrays[x])
+        elif x.startswith('attr:'):
+            attr_name, domain, data_type = x[5:].rsplit(':', 2)
+            field = _ATTRIBUTE_TYPES[data_type][0]
+            attr = mesh.attributes.new(attr_name, data_type, domain)
+            attr.data.foreach_set(field, arrays[x])
+
+    # Without edge indices edges are recalculated from loops.
+    mesh.validate()
+    mesh.update(calc_edges='edge_index' not in arrays)
+    return mesh
+
+
+def get_arrays_hash(arrays: dict) -> str:
+    """Returns content hash of arrays."""
+    h = hashlib.blake2b(digest_size=16)
+    for x in sorted(arrays):
+        h.update(x.encode())
+        h.update(numpy.ascontiguousarray(arrays[x]).tobytes())
+    return h.hexdigest()
+
+
+def get_arrays_size(arrays: dict) -> int:
+    """Returns size of arrays in bytes."""
+    return sum(x.nbytes for x in arrays.values())
+
+
+def get_mesh_backup_arrays(mesh) -> dict:
+    """Returns get_mesh_snapshot arrays with shape keys.
+
+    Shape keys are stored as 'shape_key:name'.
+    """
+    result = get_mesh_snapshot(mesh)
+    if mesh.shape_keys is not None:
+        for key in mesh.shape_keys.key_blocks:
+            x = numpy.empty(len(key.data) * 3, dtype=numpy.float32)
+            key.data.foreach_get('co', x)
+            result.update({f'shape_key:{key.name}': x})
+    return result
+
+
+def get_mesh_hash(mesh, arrays: dict) -> str:
+    """Returns content hash of mesh copy.
+
+    arrays should be get_mesh_backup_arrays of mesh. Materials are
+    hashed by name. Meshes with attributes that are not in arrays
+    can't be compared, so unique hash is returned for them.
+    """
+    for attr in mesh.attributes:
+        if not attr.name.startswith('.')\
+                and attr.data_type not in _ATTRIBUTE_TYPES:
+            return uuid.uuid4().hex
+
+    h = hashlib.blake2b(digest_size=16)
+    h.update(get_arrays_hash(arrays).encode())
+    for x in mesh.materials:
+        if x is not None:
+            h.update(x.name.encode())
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+class MeshBackupStore():
+    """
+    Stores objects backups in collection.
+
+    Every distinct mesh state is stored only once, backups of
+    objects with same mesh share mesh datablock. Backups are
+    grouped in collection per object, oldest backups are removed
+    once meshes size exceeds budget.
+
+    Mesh size is size of its arrays compared for deduplication
+    (geometry, polygons data, UVs, attributes and shape keys),
+    not memory allocated by Blender for mesh datablock.
+
+    Backups info is stored in backup collection custom property,
+    so that it can be used after reopening file.
+    """
+
+    # Backup collection custom property name.
+    __REGISTRY = 'emtk_backups'
+
+    def __init__(self, collection_name: str, budget: int):
+        """budget is max meshes arrays size in bytes."""
+        if not isinstance(collection_name, str):
+            raise TypeError
+        if len(collection_name) == 0:
+            raise ValueError
+        self.collection_name = collection_name
+        self.budget = budget
+
+    # Collections
+
+    @property
+    def collection(self):
+        """Backup collection, created if needed."""
+        c = self.collection_name
+        if c not in bpy.data.collections:
+            backups = bpy.data.collections.new(name=c)
+            bpy.context.scene.collection.children.link(backups)
+        else:
+            backups = bpy.data.collections[c]
+        return backups
+
+    def get_object_collection(self, obj_name: str):
+        """Collection with backups of object, created if needed."""
+        name = f'{self.collection_name} {obj_name}'
+        if name not in bpy.data.collections:
+            c = bpy.data.collections.new(name=name)
+            self.collection.children.link(c)
+        else:
+            c = bpy.data.collections[name]
+        return c
+
+    # Registry
+
+    def __load(self) -> dict:
+        try:
+            return json.loads(self.collection[self.__REGISTRY])
+        except KeyError:
+            # meshes: {hash: [mesh name, size]}
+            # backups: [[backup name, object name, hash, stack, time]]
+            return {'meshes': {}, 'backups': []}
+
+    def __save(self, registry: dict) -> None:
+        self.collection[self.__REGISTRY] = json.dumps(registry)
+
+    @property
+    def size(self) -> int:
+        """Size of all stored meshes arrays in bytes."""
+        return sum(x[1] for x in self.__load()['meshes'].values())
+
+    # Backups
+
+    def backup(self, obj) -> str:
+        """Stores backup of object.
+
+        Returns name of backup object.
+        """
+        if obj.mode == 'EDIT':
+            obj.update_from_editmode()
+
+        registry = self.__load()
+        arrays = get_mesh_backup_arrays(obj.data)
+        mesh_hash = get_mesh_hash(obj.data, arrays)
+        stack = json.dumps(get_stack_fingerprint(obj))
+
+        # Same mesh and modifiers are already stored,
+        # mark backup as recently used.
+        for x in registry['backups']:
+            if x[1] == obj.name and x[2] == mesh_hash and x[3] == stack\
+                    and x[0] in bpy.data.objects:
+                registry['backups'].remove(x)
+                x[4] = time.time()
+                registry['backups'].append(x)
+                self.__save(registry)
+                logger.debug(f'Backup {x[0]} reused.')
+                return x[0]
+
+        # Store mesh only if there is no mesh with same content.
+        mesh = None
+        if mesh_hash in registry['meshes']:
+            mesh = bpy.data.meshes.get(registry['meshes'][mesh_hash][0])
+        if mesh is None:
+            mesh = obj.data.copy()
+            mesh.name = f'EMTK backup {mesh_hash[:12]}'
+            registry['meshes'].update(
+                {mesh_hash: [mesh.name, get_arrays_size(arrays)]})
+
+        backup = obj.copy()
+        backup.data = mesh
+        backup.name = f'{obj.name} backup'
+        backup.hide_viewport = True
+        backup.hide_render = True
+        self.get_object_collection(obj.name).objects.link(backup)
+
+        registry['backups'].append(
+            [backup.name, obj.name, mesh_hash, stack, time.time()])
+        self.__evict(registry)
+        self.__save(registry)
+        logger.debug(f'Backup {backup.name} created.')
+        return backup.name
+
+    def get_backups(self, obj_name: str) -> list:
+        """Returns names of object backups, oldest first."""
+        result = []
+        for x in self.__load()['backups']:
+            if x[1] == obj_name:
+                result.append(x[0])
+        return result
+
+    def restore(self, obj, backup_name=None) -> bool:
+        """Replaces object mesh with copy of backup mesh.
+
+        Uses latest object backup, if backup_name is None.
+        Returns False, if there is no backup.
+        """
+        if backup_name is None:
+            backups = self.get_backups(obj.name)
+            if len(backups) == 0:
+                return False
+            backup_name = backups[-1]
+        backup = bpy.data.objects.get(backup_name)
+        if backup is None:
+            return False
+        obj.data = backup.data.copy()
+        return True
+
+    def __evict(self, registry: dict) -> None:
+        """Removes least recently used backups, until
+        meshes size fits in budget.
+        """
+        size = sum(x[1] for x in registry['meshes'].values())
+        while size > self.budget and len(registry['backups']) > 1:
+            name, obj_name, mesh_hash, stack, t = registry['backups'].pop(0)
+            backup = bpy.data.objects.get(name)
+            if backup is not None:
+                bpy.data.objects.remove(backup)
+
+            # Remove mesh, if no other backup uses it.
+            if all(x[2] != mesh_hash for x in registry['backups']):
+                mesh_name, mesh_size = registry['meshes'].pop(mesh_hash)
+                mesh = bpy.data.meshes.get(mesh_name)
+                if mesh is not None and mesh.users == 0:
+                    bpy.data.meshes.remove(mesh)
+                size -= mesh_size
+
+            # Remove empty object collection.
+            c = bpy.data.collections.get(
+                f'{self.collection_name} {obj_name}')
+            if c is not None and len(c.objects) == 0:
+                bpy.data.collections.remove(c)
+            logger.debug(f'Backup {name} removed.')
+
+
+class ArrayMeshBackupStore():
+    """
+    Stores meshes backups as compressed numpy arrays in
+    directory next to .blend file, so that backups are not
+    stored in .blend file and do not slow down its saving.
+
+    Only mesh is stored, without object and modifiers.
+    Every distinct mesh state is stored in one file per object,
+    oldest backups are removed once files size exceeds budget.
+    """
+
+    # File with backups info in backups directory.
+    __INDEX = 'index.json'
+
+    def __init__(self, budget: int, directory=None):
+        """budget is max files size in bytes.
+
+        Directory next to .blend file is used, if directory is None.
+        Temporary directory is used for not saved files.
+        """
+        if directory is None:
+            if bpy.data.filepath:
+                blend = os.path.splitext(
+                    os.path.basename(bpy.data.filepath))[0]
+                directory = os.path.join(
+                    bpy.path.abspath('//'), f'{blend}_emtk_backups')
+            else:
+                directory = os.path.join(bpy.app.tempdir, 'emtk_backups')
+        self.directory = directory
+        self.budget = budget
+
+    # Index
+
+    def __load(self) -> dict:
+        try:
+            with open(os.path.join(self.directory, self.__INDEX)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            # backups: [[object name, hash, size, time]]
+            return {'backups': []}
+
+    def __save(self, index: dict) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, self.__INDEX), 'w') as f:
+            json.dump(index, f)
+
+    def __get_path(self, obj_name: str, mesh_hash: str) -> str:
+        return os.path.join(
+            self.directory, bpy.path.clean_name(obj_name), f'{mesh_hash}.npz')
+
+    @property
+    def size(self) -> int:
+        """Size of all backups files in bytes."""
+        return sum(x[2] for x in self.__load()['backups'])
+
+    # Backups
+
+    def backup(self, obj) -> str:
+        """Writes object mesh arrays to file.
+
+        Returns mesh hash.
+        """
+        if obj.mode == 'EDIT':
+            obj.update_from_editmode()
+
+        index = self.__load()
+        arrays = get_mesh_snapshot(obj.data)
+        mesh_hash = get_arrays_hash(arrays)
+        path = self.__get_path(obj.name, mesh_hash)
+
+        # Same mesh is already stored, mark backup as recently used.
+        for x in index['backups']:
+            if x[0] == obj.name and x[1] == mesh_hash\
+                    and os.path.isfile(path):
+                index['backups'].remove(x)
+                x[3] = time.time()
+                index['backups'].append(x)
+                self.__save(index)
+                return mesh_hash
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        numpy.savez_compressed(path, **arrays)
+        index['backups'].append(
+            [obj.name, mesh_hash, os.path.getsize(path), time.time()])
+        self.__evict(index)
+        self.__save(index)
+        logger.debug(f'Backup {path} created.')
+        return mesh_hash
+
+    def get_backups(self, obj_name: str) -> list:
+        """Returns hashes of object backups, oldest first."""
+        result = []
+        for x in self.__load()['backups']:
+            if x[0] == obj_name:
+                result.append(x[1])
+        return result
+
+    def restore(self, obj, mesh_hash=None) -> bool:
+        """Replaces object mesh with mesh rebuilt from backup.
+
+        Uses latest object backup, if mesh_hash is None.
+        Returns False, if there is no backup.
+        """
+        if mesh_hash is None:
+            backups = self.get_backups(obj.name)
+            if len(backups) == 0:
+                return False
+            mesh_hash = backups[-1]
+        path = self.__get_path(obj.name, mesh_hash)
+        if not os.path.isfile(path):
+            return False
+
+        with numpy.load(path) as f:
+            arrays = dict(f)
+        mesh = create_mesh_from_snapshot(obj.data.name, arrays)
+        for x in obj.data.materials:
+            mesh.materials.append(x)
+        obj.data = mesh
+        return True
+
+    def __evict(self, index: dict) -> None:
+        """Removes least recently used backups, until
+        files size fits in budget.
+        """
+        size = sum(x[2] for x in index['backups'])
+        while size > self.budget and len(index['backups']) > 1:
+            obj_name, mesh_hash, file_size, t = index['backups'].pop(0)
+            path = self.__get_path(obj_name, mesh_hash)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= file_size
+            logger.debug(f'Backup {path} removed.')
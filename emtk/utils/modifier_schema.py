@@ -0,0 +1,199 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Registry of modifiers properties definitions.
+
+RNA definitions of modifier type do not change within Blender
+session, so they are read once per modifier type and shared by
+all editors.
+"""
+
+import logging
+
+from libemtk.utils.modifier_prop_types import get_props_filtered_by_types
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# logger.setLevel(logging.DEBUG)
+
+# {modifier type: ModifierSchema}
+_SCHEMAS = {}
+
+# {tuple of modifier types: CommonSchema}
+_COMMON_SCHEMAS = {}
+
+# {tuple of enum items identifiers: (next items, previous items)}
+_ENUM_TABLES = {}
+
+
+class PropSchema():
+    """Copy of modifier property RNA definition."""
+
+    __NUMBER_TYPES = {'INT', 'FLOAT'}
+
+    def __init__(self, prop_def):
+        self.name = prop_def.identifier
+        self.type = prop_def.type
+        self.subtype = prop_def.subtype
+        self.unit = prop_def.unit
+        self.is_array = getattr(prop_def, 'is_array', False)
+
+        # Limits
+        self.hard_min = None
+        self.hard_max = None
+        self.soft_min = None
+        self.soft_max = None
+        self.step = None
+        self.precision = None
+        if self.type in self.__NUMBER_TYPES:
+            self.hard_min = prop_def.hard_min
+            self.hard_max = prop_def.hard_max
+            self.soft_min = prop_def.soft_min
+            self.soft_max = prop_def.soft_max
+            self.step = prop_def.step
+            if self.type == 'FLOAT':
+                self.precision = prop_def.precision
+
+        # Enum items identifiers and cycling tables.
+        self.enum_items = ()
+        self.enum_next = {}
+        self.enum_previous = {}
+        self.is_enum_flag = False
+        if self.type == 'ENUM':
+            self.enum_items = tuple(prop_def.enum_items.keys())
+            self.enum_next, self.enum_previous = get_enum_tables(
+                self.enum_items)
+            self.is_enum_flag = prop_def.is_enum_flag
+
+    def __repr__(self):
+        return f'PropSchema({self.name}, {self.type}, {self.subtype})'
+
+
+class ModifierSchema():
+    """Editable properties of modifier type."""
+
+    def __init__(self, modifier):
+        self.type = modifier.type
+
+        # {prop type: set of props names}
+        self.props_by_type = get_props_filtered_by_types(modifier)
+
+        # {prop name: PropSchema}
+        self.props = {}
+        prop_defs = modifier.rna_type.properties
+        for x in self.props_by_type.values():
+            for y in x:
+                self.props.update({y: PropSchema(prop_defs[y])})
+
+    def __repr__(self):
+        return f'ModifierSchema({self.type}, {len(self.props)} props)'
+
+
+class CommonSchema():
+    """Properties that can be edited on all of modifier types.
+
+    Properties are common if they have same name, type and
+    array flag. props contains definitions from first schema.
+    """
+
+    def __init__(self, schemas: list):
+        if len(schemas) == 0:
+            raise ValueError
+        self.type = tuple(x.type for x in schemas)
+
+        self.props = {}
+        self.props_by_type = {}
+        first = schemas[0]
+        for name, prop in first.props.items():
+            common = True
+            for x in schemas[1:]:
+                y = x.props.get(name)
+                if y is None or y.type != prop.type\
+                        or y.is_array != prop.is_array:
+                    common = False
+                    break
+            if common:
+                self.props.update({name: prop})
+                self.props_by_type.setdefault(prop.type, set()).add(name)
+
+    def __repr__(self):
+        return f'CommonSchema({self.type}, {len(self.props)} props)'
+
+
+def get_modifier_schema(modifier) -> ModifierSchema:
+    """Returns schema of modifier type.
+
+    Schema is created from modifier on first call for its type.
+    """
+    x = _SCHEMAS.get(modifier.type)
+    if x is None:
+        x = ModifierSchema(modifier)
+        _SCHEMAS.update({modifier.type: x})
+        logger.debug(f'Created {x}')
+    return x
+
+
+def get_enum_tables(items: tuple) -> tuple:
+    """Returns ({item: next item}, {item: previous item}) tables
+    for enum items identifiers.
+    """
+    x = _ENUM_TABLES.get(items)
+    if x is None:
+        next_items = {}
+        previous_items = {}
+        for i, y in enumerate(items):
+            next_items.update({y: items[(i + 1) % len(items)]})
+            previous_items.update({y: items[i - 1]})
+        x = (next_items, previous_items)
+        _ENUM_TABLES.update({items: x})
+    return x
+
+
+def get_enum_successor(prop, value, reverse=False):
+    """Returns enum item after value, or None.
+
+    Items are read from modifier type, items that depend
+    on modifier instance are not cycled through.
+    """
+    if reverse:
+        return prop.enum_previous.get(value)
+    return prop.enum_next.get(value)
+
+
+def get_common_schema(schemas: list):
+    """Returns schema with properties common for all schemas.
+
+    Returns schema itself, if there is only one.
+    """
+    if len(schemas) == 1:
+        return schemas[0]
+    key = tuple(x.type for x in schemas)
+    x = _COMMON_SCHEMAS.get(key)
+    if x is None:
+        x = CommonSchema(schemas)
+        _COMMON_SCHEMAS.update({key: x})
+        logger.debug(f'Created {x}')
+    return x
+
+
+def clear_modifier_schemas() -> None:
+    _SCHEMAS.clear()
+    _COMMON_SCHEMAS.clear()
+    _ENUM_TABLES.clear()
@@ -0,0 +1,198 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Copyright 2022, Sergey Shapochkin
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Index of modal shortcuts groups.
+
+ModalShortcutsGroup lookups are linear, so lookups by event and
+by shortcut id are stored per modifier type. Index is invalidated
+when shortcuts are changed from addon preferences.
+
+Generated shortcuts are kept in memory and saved to addon
+preferences in one pass, when no modal operator uses them.
+"""
+
+import logging
+
+import bpy
+from modal_shortcuts.shortcuts import (ModalShortcutsGroup,
+                                       generate_new_shortcut)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# logger.setLevel(logging.DEBUG)
+
+# {modifier type: ShortcutsIndex}
+_SHORTCUTS_INDEX = {}
+
+# Modifier types with generated shortcuts that were not saved.
+_CHANGED_SHORTCUTS = set()
+
+# Number of running operators that should not be interrupted by saving.
+_FLUSH_HOLDS = 0
+
+# Delay before saving generated shortcuts from timer in seconds.
+_FLUSH_DELAY = 5.0
+
+
+class ShortcutsIndex():
+    """Hashed lookups for ModalShortcutsGroup."""
+
+    def __init__(self, group):
+        self.group = group
+
+        # {shortcut id: shortcut}
+        self.__ids = {}
+        for x in group.shortcuts:
+            self.__ids.update({x.shortcut_id: x})
+
+        # {(event type, shift, ctrl, alt): shortcut or None}
+        self.__events = {}
+
+    @property
+    def shortcuts(self):
+        return self.group.shortcuts
+
+    def find_by_event(self, event):
+        """Returns shortcut for event, or None."""
+        key = (event.type, event.shift, event.ctrl, event.alt)
+        try:
+            return self.__events[key]
+        except KeyError:
+            x = self.group.find_by_event(event)
+            self.__events.update({key: x})
+            return x
+
+    def find_by_shortcut_id(self, shortcut_id: str):
+        """Returns shortcut with shortcut_id, or None."""
+        return self.__ids.get(shortcut_id)
+
+    def add(self, shortcut) -> None:
+        """Adds shortcut to group."""
+        self.group.add(shortcut)
+        self.__ids.update({shortcut.shortcut_id: shortcut})
+        self.__events.clear()
+
+
+def get_shortcuts_index(value: str):
+    """Returns ShortcutsIndex for value, or None if there is
+    no shortcuts group for it.
+    """
+    x = _SHORTCUTS_INDEX.get(value)
+    if x is not None:
+        return x
+
+    prefs = bpy.context.preferences.addons['emtk'].preferences
+    group = prefs.modal_shortcuts.find_by_value(value)
+    if group is None:
+        return None
+    return add_shortcuts_index(value, group)
+
+
+def add_shortcuts_index(value: str, group) -> ShortcutsIndex:
+    """Creates ShortcutsIndex for new shortcuts group."""
+    x = ShortcutsIndex(group)
+    _SHORTCUTS_INDEX.update({value: x})
+    logger.debug(f'Indexed {len(group.shortcuts)} shortcuts for {value}')
+    return x
+
+
+def get_or_generate_shortcuts(value: str, props) -> ShortcutsIndex:
+    """Returns ShortcutsIndex for value with shortcut for every
+    prop name in props.
+
+    Generated shortcuts are saved later by flush_shortcuts.
+    """
+    s = get_shortcuts_index(value)
+
+    # Create new shortcuts group, if needed.
+    if s is None:
+        s = add_shortcuts_index(value, ModalShortcutsGroup(value, []))
+
+    # Generate missing shortcuts.
+    new_props = []
+    for x in props:
+        if s.find_by_shortcut_id(x) is None:
+            new_props.append(x)
+    for x in new_props:
+        s.add(generate_new_shortcut(x, s.shortcuts))
+
+    if len(new_props) > 0:
+        _CHANGED_SHORTCUTS.add(value)
+        _schedule_flush()
+        logger.debug(f'Generated {len(new_props)} shortcuts for {value}')
+    return s
+
+
+def flush_shortcuts() -> None:
+    """Saves generated shortcuts to addon preferences."""
+    if bpy.app.timers.is_registered(_flush_timer):
+        bpy.app.timers.unregister(_flush_timer)
+    if len(_CHANGED_SHORTCUTS) == 0:
+        return
+
+    # Saving can refresh preferences cache, which invalidates index.
+    groups = []
+    for x in _CHANGED_SHORTCUTS:
+        s = _SHORTCUTS_INDEX.get(x)
+        if s is not None:
+            groups.append(s.group)
+    _CHANGED_SHORTCUTS.clear()
+
+    prefs = bpy.context.preferences.addons['emtk'].preferences
+    for x in groups:
+        prefs.modal_shortcuts.update(x)
+    logger.debug(f'Saved shortcuts for {len(groups)} types')
+
+
+def hold_shortcuts_flush() -> None:
+    """Prevents saving shortcuts from timer until release."""
+    global _FLUSH_HOLDS
+    _FLUSH_HOLDS += 1
+
+
+def release_shortcuts_flush() -> None:
+    """Saves shortcuts, if nothing else holds them."""
+    global _FLUSH_HOLDS
+    _FLUSH_HOLDS = max(_FLUSH_HOLDS - 1, 0)
+    if _FLUSH_HOLDS == 0:
+        flush_shortcuts()
+
+
+def _schedule_flush() -> None:
+    if not bpy.app.timers.is_registered(_flush_timer):
+        bpy.app.timers.register(_flush_timer, first_interval=_FLUSH_DELAY)
+
+
+def _flush_timer():
+    # Try again later, if operator is running.
+    if _FLUSH_HOLDS > 0:
+        return _FLUSH_DELAY
+    flush_shortcuts()
+
+
+def invalidate_shortcuts_index(value=None) -> None:
+    """Removes index for value, or all indices.
+
+    Generated shortcuts should be saved before.
+    """
+    if value is None:
+        _SHORTCUTS_INDEX.clear()
+    else:
+        _SHORTCUTS_INDEX.pop(value, None)